@@ -65,11 +65,16 @@ class AdventureMixin(ABC):
         self.THREATEE: list = None
         self.TR_GEAR_SET: dict = None
         self.ATTRIBS: dict = None
+        self._attrib_keys: Tuple[str, ...] = ()
         self.MONSTERS: dict = None
         self.AS_MONSTERS: dict = None
         self.MONSTER_NOW: dict = None
         self.LOCATIONS: list = None
         self.PETS: dict = None
+        self._pet_list: Optional[dict] = None
+        self._pet_choices: Tuple[str, ...] = ()
+        self.ACTION_RESPONSE: dict = None
+        self._action_responses: Dict[str, Dict[str, Tuple[str, ...]]] = {}
         self.EQUIPMENT: dict = None
         self.MATERIALS: dict = None
         self.PREFIXES: dict = None
@@ -85,6 +90,10 @@ class AdventureMixin(ABC):
     def get_lock(self, member: discord.User) -> asyncio.Lock:
         raise NotImplementedError()
 
+    @abstractmethod
+    async def get_pet_list(self) -> dict:
+        raise NotImplementedError()
+
     @abstractmethod
     def in_adventure(self, ctx: Optional[commands.Context] = None, user: Optional[discord.Member] = None) -> bool:
         raise NotImplementedError()
@@ -6,7 +6,7 @@ import logging
 import random
 import time
 from abc import ABC
-from datetime import datetime, timedelta
+from datetime import datetime
 from types import SimpleNamespace
 from typing import Dict, Literal, MutableMapping, Optional, Tuple, Union
 
@@ -30,7 +30,7 @@ from .cart import Trader
 from .character import CharacterCommands
 from .charsheet import Character, Item, calculate_sp, has_funds
 from .class_abilities import ClassAbilities
-from .constants import DEV_LIST, ANSITextColours, HeroClasses, Rarities, Treasure
+from .constants import DEV_LIST, NAZARICK_SETS, ANSITextColours, HeroClasses, Rarities, Treasure
 from .converters import ArgParserFailure, ChallengeConverter
 from .defaults import default_global, default_guild, default_user
 from .dev import DevCommands
@@ -169,12 +169,16 @@ class Adventure(
         self.THREATEE: list = None
         self.TR_GEAR_SET: dict = None
         self.ATTRIBS: dict = None
+        self._attrib_keys: Tuple[str, ...] = ()
         self.MONSTERS: Dict[str, Monster] = None
         self.AS_MONSTERS: dict = None
         self.MONSTER_NOW: dict = None
         self.LOCATIONS: list = None
         self.PETS: dict = None
+        self._pet_list: Optional[dict] = None
+        self._pet_choices: Tuple[str, ...] = ()
         self.ACTION_RESPONSE: dict = None
+        self._action_responses: Dict[str, Dict[str, Tuple[str, ...]]] = {}
 
         self.config.register_guild(**default_guild)
         self.config.register_global(**default_global)
@@ -288,8 +292,10 @@ class Adventure(
 
             with files["pets"].open("r") as f:
                 self.PETS = json.load(f)
+            self._pet_list = None
             with files["attr"].open("r") as f:
                 self.ATTRIBS = json.load(f)
+            self._attrib_keys = tuple(self.ATTRIBS)
             with files["monster"].open("r") as f:
                 self.MONSTERS = json.load(f)
             with files["as_monsters"].open("r") as f:
@@ -314,6 +320,14 @@ class Adventure(
                 self.SET_BONUSES = json.load(f)
             with files["action_response"].open("r") as f:
                 self.ACTION_RESPONSE = json.load(f)
+            # every class also draws from the generic hero lines, so join them once per theme load
+            self._action_responses = {}
+            for action, responses in self.ACTION_RESPONSE.items():
+                hero_lines = tuple(responses.get("hero", ()))
+                self._action_responses[action] = {
+                    name: tuple(lines) if name == "hero" else tuple(lines) + hero_lines
+                    for name, lines in responses.items()
+                }
 
             if not all(
                 i
@@ -511,13 +525,22 @@ class Adventure(
             self.locks[member.id] = asyncio.Lock()
         return self.locks[member.id]
 
+    async def get_pet_list(self) -> dict:
+        """Return the theme's pets merged with any custom pets, cached until the theme or pets change."""
+        if self._pet_list is None:
+            theme = await self.config.theme()
+            extra_pets = await self.config.themes.all()
+            extra_pets = extra_pets.get(theme, {}).get("pets", {})
+            self._pet_list = {**self.PETS, **extra_pets}
+            self._pet_choices = tuple(self._pet_list)
+        return self._pet_list
+
     async def _garbage_collection(self):
         await self.bot.wait_until_red_ready()
-        delta = timedelta(minutes=6)
         with contextlib.suppress(asyncio.CancelledError):
             while True:
                 async for guild_id, session in AsyncIter(self._sessions.copy().items(), steps=100):
-                    if datetime.now() > (session.start_time + delta):
+                    if time.monotonic() - session.start_time > 360:
                         if guild_id in self._sessions:
                             log.debug("Removing old session from %s", guild_id)
                             del self._sessions[guild_id]
@@ -586,6 +609,7 @@ class Adventure(
         except Exception as exc:
             if ctx.guild.id in self._sessions:
                 self._sessions[ctx.guild.id].finished = True
+                self._sessions[ctx.guild.id].stop()
             await self.config.guild(ctx.guild).cooldown.set(0)
             log.exception("Something went wrong controlling the game", exc_info=exc)
             while ctx.guild.id in self._sessions:
@@ -654,6 +678,7 @@ class Adventure(
         ):
             if ctx.guild.id in self._sessions:
                 self._sessions[ctx.guild.id].finished = True
+                self._sessions[ctx.guild.id].stop()
             while ctx.guild.id in self._sessions:
                 del self._sessions[ctx.guild.id]
             handled = False
@@ -897,7 +922,7 @@ class Adventure(
         if attribute and attribute.lower() in self.ATTRIBS:
             attribute = attribute.lower()
         else:
-            attribute = rng.choice(list(self.ATTRIBS.keys()))
+            attribute = rng.choice(self._attrib_keys)
         new_challenge = challenge
         easy_mode = await self.config.easy_mode()
         monster = monster_roster[challenge].copy()
@@ -1006,7 +1031,7 @@ class Adventure(
         session = self._sessions[ctx.guild.id]
         easy_mode = session.easy_mode
         embed = discord.Embed(colour=discord.Colour.blurple())
-        embed.set_footer(text=f"Seed {hex(session.rng.internal_seed)[2:].upper()}")
+        embed.set_footer(text=f"Seed {session.rng.internal_seed.to_hex()}")
         use_embeds = await self.config.guild(ctx.guild).embed() and ctx.channel.permissions_for(ctx.me).embed_links
         if easy_mode:
             dragon_text = _(
@@ -1093,6 +1118,7 @@ class Adventure(
         except Exception as exc:
             timer.cancel()
             log.exception("Error with the countdown timer", exc_info=exc)
+        session.stop()
         await adventure_msg.edit(view=None)
         try:
             return await self._result(ctx, adventure_msg)
@@ -2419,7 +2445,7 @@ class Adventure(
                     except Exception as exc:
                         log.exception("Error with the new character sheet", exc_info=exc)
                         continue
-                    if any(x in c.sets for x in ["The Supreme One", "Ainz Ooal Gown"]):
+                    if not NAZARICK_SETS.isdisjoint(c.sets):
                         failed = False
                         break
                     with contextlib.suppress(KeyError):
@@ -2515,13 +2541,13 @@ class Adventure(
 
         async def adv_countdown():
             secondint = int(seconds)
-            adv_end = await _get_epoch(secondint)
-            timer, done, sremain = await _remaining(adv_end)
+            adv_end = _get_epoch(secondint)
+            timer, done, sremain = _remaining(adv_end)
             timer = f"<t:{int(adv_end)}:R>"
             message_adv = await ctx.send(f"⏳ [{title}] {timer}")
             deleted = False
             while not done:
-                timer, done, sremain = await _remaining(adv_end)
+                timer, done, sremain = _remaining(adv_end)
                 self._adventure_countdown[ctx.guild.id] = (timer, done, sremain)
                 if done:
                     if not deleted:
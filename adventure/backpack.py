@@ -495,11 +495,11 @@ class BackPackCommands(AdventureMixin):
                     item_price = 0
                     old_owned = item.owned
                     async for _loop_counter in AsyncIter(range(0, old_owned), steps=100):
-                        item.owned -= 1
                         item_price += _sell(c, item)
-                        log.debug(f"{item_price=}")
-                        if item.owned <= 0:
-                            del c.backpack[item.name]
+                    log.debug(f"{item_price=}")
+                    if old_owned > 0:
+                        item.owned = 0
+                        del c.backpack[item.name]
                     item_price = max(item_price, 0)
                     msg += _("{old_item} sold for {price}.\n").format(
                         old_item=str(old_owned) + " " + item.ansi,
@@ -969,9 +969,10 @@ class BackPackCommands(AdventureMixin):
                         old_owned = item.owned
                         item_price = 0
                         async for _loop_counter in AsyncIter(range(0, old_owned), steps=100):
-                            item.owned -= 1
                             item_price += _sell(character, item)
-                            if item.owned <= 0 and item.name in character.backpack:
+                        if old_owned > 0:
+                            item.owned = 0
+                            if item.name in character.backpack:
                                 del character.backpack[item.name]
                         item_price = max(item_price, 0)
                         msg += _("{old_item} sold for {price}.\n").format(
@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import asyncio
 import logging
 import random
 import time
+from copy import copy
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 
@@ -21,11 +23,27 @@ _ = Translator("Adventure", __file__)
 
 log = logging.getLogger("red.cogs.adventure")
 
+# 35% normal, 35% rare, 25% epic, 5% legendary
+_CART_RARITIES = (Rarities.normal, Rarities.rare, Rarities.epic, Rarities.legendary)
+_CART_RARITY_CUM_WEIGHTS = (0.35, 0.70, 0.95, 1.0)
+# price per point of the item's main stat
+_CART_PRICE_RANGES = {
+    # 1 stat for normal, want to be <1k
+    Rarities.normal: (100, 500),
+    # around 3 stat for rare, want to be about 3k
+    Rarities.rare: (500, 1000),
+    # min. 5 stat for epic, want to be about 25k
+    Rarities.epic: (1000, 2000),
+    # min. 10 stat for legendary, want to be about 50k
+    Rarities.legendary: (2500, 5000),
+}
+
 
 class TraderModal(discord.ui.Modal):
-    def __init__(self, item: Item, cog: commands.Cog, view: Trader, ctx: commands.Context):
+    def __init__(self, item: Item, cog: commands.Cog, view: Trader, ctx: commands.Context, unit_price: int):
         super().__init__(title=_("How many would you like to buy?"))
         self.item = item
+        self.unit_price = unit_price
         self.cog = cog
         self.ctx = ctx
         self.view = view
@@ -43,7 +61,7 @@ class TraderModal(discord.ui.Modal):
         await smart_embed(None, _("You're wasting my time."), interaction=interaction, ephemeral=True)
 
     async def on_submit(self, interaction: discord.Interaction):
-        if datetime.now(timezone.utc) >= self.view.end_time:
+        if time.monotonic() >= self.view.end_monotonic:
             self.view.stop()
             await interaction.response.send_message(
                 _("{cart_name} has moved onto the next village.").format(cart_name=self.view.cart_name), ephemeral=True
@@ -63,38 +81,43 @@ class TraderModal(discord.ui.Modal):
             await self.wasting_time(interaction)
             return
 
-        currency_name = await bank.get_currency_name(
-            interaction.guild,
-        )
-        if currency_name.startswith("<"):
-            currency_name = "credits"
+        currency_name = self.view.currency_name
         spender = interaction.user
-        price = self.view.items.get(self.item.name, {}).get("price") * number
+        author = escape(spender.display_name)
+        price = self.unit_price * number
         if await bank.can_spend(spender, price):
             await bank.withdraw_credits(spender, price)
             async with self.cog.get_lock(spender):
+                data = await self.cog.config.user(spender).all()
                 try:
-                    c = await Character.from_json(self.ctx, self.cog.config, spender, self.cog._daily_bonus)
+                    c = await Character.from_json(self.ctx, self.cog.config, spender, self.cog._daily_bonus, data=data)
                 except Exception as exc:
                     log.exception("Error with the new character sheet", exc_info=exc)
                     return
 
                 if c.is_backpack_full(is_dev=is_dev(spender)):
                     await interaction.response.send_message(
-                        _("**{author}**, Your backpack is currently full.").format(author=escape(spender.display_name))
+                        _("**{author}**, Your backpack is currently full.").format(author=author)
                     )
                     return
-                item = self.item
+                # copy so repeat purchases don't share one Item between backpacks
+                item = copy(self.item)
                 item.owned = number
                 await c.add_to_backpack(item, number=number)
-                await self.cog.config.user(spender).set(await c.to_json(self.ctx, self.cog.config))
+                user_config = self.cog.config.user(spender)
+                if "backpack" in data:
+                    # Only the purchased entry changed so skip re-serializing the whole sheet.
+                    entry = c.backpack[item.name].to_json()[item.name]
+                    await user_config.set_raw("backpack", item.name, value=entry)
+                else:
+                    await user_config.set(await c.to_json(self.ctx, self.cog.config))
                 await interaction.response.send_message(
                     box(
                         _(
                             "{author} bought {p_result} {item_name} for "
                             "{item_price} {currency_name} and put it into their backpack."
                         ).format(
-                            author=escape(spender.display_name),
+                            author=author,
                             p_result=number,
                             item_name=item.ansi,
                             item_price=humanize_number(price),
@@ -106,7 +129,7 @@ class TraderModal(discord.ui.Modal):
         else:
             await interaction.response.send_message(
                 _("**{author}**, you do not have enough {currency_name}.").format(
-                    author=escape(spender.display_name), currency_name=currency_name
+                    author=author, currency_name=currency_name
                 )
             )
 
@@ -118,38 +141,41 @@ class TraderButton(discord.ui.Button):
         self.cog = cog
 
     async def callback(self, interaction: discord.Interaction):
-        if datetime.now(timezone.utc) >= self.view.end_time:
+        if time.monotonic() >= self.view.end_monotonic:
             self.view.stop()
             await self.view.on_timeout()
             await interaction.response.send_message(
                 _("{cart_name} has moved onto the next village.").format(cart_name=self.view.cart_name), ephemeral=True
             )
             return
-        modal = TraderModal(self.item, self.cog, view=self.view, ctx=self.view.ctx)
+        modal = TraderModal(
+            self.item,
+            self.cog,
+            view=self.view,
+            ctx=self.view.ctx,
+            unit_price=self.view.items[self.item.name]["price"],
+        )
         await interaction.response.send_modal(modal)
 
 
 class TraderSelect(discord.ui.Select):
-    def __init__(self, items: List[Item], cog: commands.Cog):
+    def __init__(self, items: List[Item], options: List[discord.SelectOption], cog: commands.Cog):
         self.items = items
         self.cog = cog
-        self.select_options = [
-            discord.SelectOption(label=str(item), value=str(i), description=item.stat_str(), emoji=item.rarity.emoji)
-            for i, item in enumerate(items)
-        ]
-        super().__init__(
-            min_values=1, max_values=1, placeholder=_("What would you like to purchase?"), options=self.select_options
-        )
+        super().__init__(min_values=1, max_values=1, placeholder=_("What would you like to purchase?"), options=options)
 
     async def callback(self, interaction: discord.Interaction):
-        if datetime.now(timezone.utc) >= self.view.end_time:
+        if time.monotonic() >= self.view.end_monotonic:
             self.view.stop()
             await self.view.on_timeout()
             await interaction.response.send_message(
                 _("{cart_name} has moved onto the next village.").format(cart_name=self.view.cart_name), ephemeral=True
             )
             return
-        modal = TraderModal(self.items[int(self.values[0])], self.cog, view=self.view, ctx=self.view.ctx)
+        item = self.items[int(self.values[0])]
+        modal = TraderModal(
+            item, self.cog, view=self.view, ctx=self.view.ctx, unit_price=self.view.items[item.name]["price"]
+        )
         await interaction.response.send_modal(modal)
 
 
@@ -162,7 +188,9 @@ class Trader(discord.ui.View):
         self.message = None
         self.stock_str = ""
         self.end_time = datetime.now(timezone.utc) + timedelta(seconds=timeout)
+        self.end_monotonic = time.monotonic() + timeout
         self.cart_name = _("Hawl's brother")
+        self.currency_name = "credits"
 
     async def on_timeout(self):
         if self.message is not None:
@@ -174,6 +202,7 @@ class Trader(discord.ui.View):
         if self.timeout is None:
             return
         self.end_time = datetime.now(timezone.utc) + timedelta(seconds=self.timeout)
+        self.end_monotonic = time.monotonic() + self.timeout
         timestamp = f"<t:{int(self.end_time.timestamp())}:R>"
         text = self.stock_str
         text += _("I am leaving {time}.\nDo you want to buy any of these fine items? Tell me which one below:").format(
@@ -182,24 +211,25 @@ class Trader(discord.ui.View):
         await self.message.edit(content=text)
 
     async def start(self, ctx: commands.Context, bypass: bool = False, stockcount: Optional[int] = None):
-        cart = await self.cog.config.cart_name()
-        if await self.cog.config.guild(ctx.guild).cart_name():
-            cart = await self.cog.config.guild(ctx.guild).cart_name()
+        now = time.time()
+        last_trade = self.cog._last_trade.get(ctx.guild.id, 0)
+        if not bypass and last_trade and last_trade >= now - self.timeout:
+            # trader can return after 3 hours have passed since last visit.
+            return  # silent return.
+        self.cog._last_trade[ctx.guild.id] = now
+
+        guild_config = self.cog.config.guild(ctx.guild)
+        global_cart, guild_cart, currency_name, room = await asyncio.gather(
+            self.cog.config.cart_name(),
+            guild_config.cart_name(),
+            bank.get_currency_name(ctx.guild),
+            guild_config.cartroom(),
+        )
+        cart = guild_cart or global_cart
         self.cart_name = cart
         cart_header = _("[{cart_name} is bringing the cart around!]").format(cart_name=cart) + "\n\n"
         text = ANSITextColours.blue.as_str(cart_header)
-        if ctx.guild.id not in self.cog._last_trade:
-            self.cog._last_trade[ctx.guild.id] = 0
 
-        if not bypass:
-            if self.cog._last_trade[ctx.guild.id] == 0:
-                self.cog._last_trade[ctx.guild.id] = time.time()
-            elif self.cog._last_trade[ctx.guild.id] >= time.time() - self.timeout:
-                # trader can return after 3 hours have passed since last visit.
-                return  # silent return.
-        self.cog._last_trade[ctx.guild.id] = time.time()
-
-        room = await self.cog.config.guild(ctx.guild).cartroom()
         if room:
             room = ctx.guild.get_channel(room)
         if room is None or bypass:
@@ -209,18 +239,13 @@ class Trader(discord.ui.View):
         self.cog._curent_trader_stock[ctx.guild.id] = (stockcount, {})
 
         stock = await self.generate(stockcount)
-        currency_name = await bank.get_currency_name(
-            ctx.guild,
-        )
-        if str(currency_name).startswith("<"):
+        if currency_name[:1] == "<":
             currency_name = "credits"
+        self.currency_name = currency_name
+        price_colour = ANSIBackgroundTextColours(ANSITextColours.white, ANSIBackgroundColours.orange).as_str
+        price_strs = [price_colour(f"{humanize_number(item['price'])} {currency_name}") for item in stock.values()]
         table = None
-        price_colour = ANSIBackgroundTextColours(ANSITextColours.white, ANSIBackgroundColours.orange)
-        for index, item in enumerate(stock):
-            item = stock[index]
-            price = item["price"]
-            price_str = f"{humanize_number(price)} {currency_name}"
-            price_str = price_colour.as_str(price_str)
+        for item, price_str in zip(stock.values(), price_strs):
             if table is None:
                 table = item["item"].table(None)
                 stats = table.rows.pop(-1)
@@ -231,17 +256,16 @@ class Trader(discord.ui.View):
             else:
                 item_name, item_row = item["item"].row(None)
                 table.rows.append([item_name])
-                table.rows.append([item_row])
-                stats = table.rows.pop(-1)
                 table.rows.append([price_str])
-                table.rows.append(stats)
+                table.rows.append([item_row])
         text += str(table)
         self.stock_str = text
         timestamp = f"<t:{int(self.end_time.timestamp())}:R>"
 
-        pages = list(pagify(text, delims=["```", "\n"], priority=True, page_length=1900))
         msg_ref = None
-        for page in pages:
+        # Pages are sent one at a time on purpose, sending them concurrently
+        # lets Discord deliver the stock table out of order.
+        for page in pagify(text, delims=["```", "\n"], priority=True, page_length=1900):
             msg_ref = await room.send(box(page, lang="ansi"))
         last_page_text = _(
             "I am leaving {time}.\nDo you want to buy any of these fine items? Tell me which one below:"
@@ -250,40 +274,21 @@ class Trader(discord.ui.View):
         self.cog.bot.dispatch("adventure_cart", ctx)  # dispatch after all messages sent
 
     async def generate(self, howmany: int = 5):
-        output = {}
         howmany = max(min(25, howmany), 1)
+        rarities = []
         while len(self.items) < howmany:
-            rarity_roll = random.random()
-            #  rarity_roll = .9
-            # 1% legendary
-            if rarity_roll >= 0.95:
-                item = await self.ctx.cog._genitem(self.ctx, Rarities.legendary)
-                # min. 10 stat for legendary, want to be about 50k
-                price = random.randint(2500, 5000)
-            # 20% epic
-            elif rarity_roll >= 0.7:
-                item = await self.ctx.cog._genitem(self.ctx, Rarities.epic)
-                # min. 5 stat for epic, want to be about 25k
-                price = random.randint(1000, 2000)
-            # 35% rare
-            elif rarity_roll >= 0.35:
-                item = await self.ctx.cog._genitem(self.ctx, Rarities.rare)
-                # around 3 stat for rare, want to be about 3k
-                price = random.randint(500, 1000)
-            else:
-                item = await self.ctx.cog._genitem(self.ctx, Rarities.normal)
-                # 1 stat for normal, want to be <1k
-                price = random.randint(100, 500)
-            # 35% normal
-            price *= item.max_main_stat
-
-            self.items.update({item.name: {"itemname": item.name, "item": item, "price": price, "lvl": item.lvl}})
-            # self.add_item(TraderButton(item, self.cog))
-        item_list = []
-        for item, data in self.items.items():
-            item_list.append(data["item"])
-        self.add_item(TraderSelect(item_list, self.cog))
+            if not rarities:
+                # Duplicate item names replace each other so draw another batch if we run short.
+                rarities = random.choices(_CART_RARITIES, cum_weights=_CART_RARITY_CUM_WEIGHTS, k=howmany)
+            rarity = rarities.pop()
+            item = await self.ctx.cog._genitem(self.ctx, rarity)
+            price = random.randint(*_CART_PRICE_RANGES[rarity]) * item.max_main_stat
 
-        for index, item in enumerate(self.items):
-            output.update({index: self.items[item]})
-        return output
+            self.items[item.name] = {"itemname": item.name, "item": item, "price": price, "lvl": item.lvl}
+        item_list = [data["item"] for data in self.items.values()]
+        select_options = [
+            discord.SelectOption(label=str(item), value=str(i), description=item.stat_str(), emoji=item.rarity.emoji)
+            for i, item in enumerate(item_list)
+        ]
+        self.add_item(TraderSelect(item_list, select_options, self.cog))
+        return dict(enumerate(self.items.values()))
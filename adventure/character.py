@@ -185,7 +185,7 @@ class CharacterCommands(AdventureMixin):
                 ephemeral=True,
             )
 
-        title_cased_set_name = await _title_case(set_name)
+        title_cased_set_name = _title_case(set_name)
         sets = self.SET_BONUSES.get(title_cased_set_name)
         if sets is None:
             return await smart_embed(
@@ -17,7 +17,17 @@ from redbot.core.utils import AsyncIter
 from redbot.core.utils.chat_formatting import box, escape, humanize_list, humanize_number, pagify
 
 from .bank import bank
-from .constants import DEV_LIST, REBIRTH_LVL, REBIRTH_STEP, ANSITextColours, HeroClasses, Rarities, Slot, Treasure
+from .constants import (
+    DEV_LIST,
+    NAZARICK_SETS,
+    REBIRTH_LVL,
+    REBIRTH_STEP,
+    ANSITextColours,
+    HeroClasses,
+    Rarities,
+    Slot,
+    Treasure,
+)
 
 log = logging.getLogger("red.cogs.adventure")
 
@@ -389,7 +399,7 @@ class Character:
         self.skill: dict = kwargs.pop("skill")
         self.bal: int = kwargs.pop("bal")
         self.user: discord.Member = kwargs.pop("user")
-        self.sets = []
+        self.sets = frozenset()
         self.rebirths = kwargs.pop("rebirths", 0)
         self.last_known_currency = kwargs.get("last_known_currency")
         self.last_currency_check = kwargs.get("last_currency_check")
@@ -466,7 +476,7 @@ class Character:
                 .get("bonuses", {})
                 .get("req", {})
             )
-            if any(x in self.sets for x in ["The Supreme One", "Ainz Ooal Gown"]) and self.heroclass["pet"]["name"] in [
+            if not NAZARICK_SETS.isdisjoint(self.sets) and self.heroclass["pet"]["name"] in [
                 "Albedo",
                 "Rubedo",
                 "Guardians of Nazarick",
@@ -592,7 +602,7 @@ class Character:
                 set_names[item.set] = (parts, count + 1, bonus)
         full_sets = [(s, v[1]) for s, v in set_names.items() if v[1] >= v[0]]
         partial_sets = [(s, v[1]) for s, v in set_names.items()]
-        self.sets = [s for s, _ in full_sets if s]
+        self.sets = frozenset(s for s, _ in full_sets if s)
         for _set, parts in partial_sets:
             set_bonuses = self._ctx.bot.get_cog("Adventure").SET_BONUSES.get(_set, [])
             for bonus in set_bonuses:
@@ -626,9 +636,7 @@ class Character:
                 if not self.heroclass["pet"]:
                     class_desc += _("\n\n- Current pet: [None]")
                 elif self.heroclass["pet"]:
-                    if any(x in self.sets for x in ["The Supreme One", "Ainz Ooal Gown"]) and self.heroclass["pet"][
-                        "name"
-                    ] in [
+                    if not NAZARICK_SETS.isdisjoint(self.sets) and self.heroclass["pet"]["name"] in [
                         "Albedo",
                         "Rubedo",
                         "Guardians of Nazarick",
@@ -1370,6 +1378,13 @@ class Character:
                 equipped.append(get_place_holder(self._ctx, slot))
         return equipped
 
+    def get_equipped_by_rarity(self) -> Dict[Rarities, List[Item]]:
+        """returns the currently equipped Items grouped by rarity."""
+        equipped = {}
+        for item in self.get_current_equipment():
+            equipped.setdefault(item.rarity, []).append(item)
+        return equipped
+
     async def unequip_item(self, item: Item):
         """This handles moving an item equipment to backpack."""
         if item.name in self.backpack:
@@ -1390,9 +1405,15 @@ class Character:
         config: Config,
         user: Union[discord.Member, discord.User],
         daily_bonus_mapping: Dict[str, float],
+        *,
+        data: Optional[dict] = None,
     ):
-        """Return a Character object from config and user."""
-        data = await config.user(user).all()
+        """Return a Character object from config and user.
+
+        Pass ``data`` when the user's config has already been read to avoid reading it again.
+        """
+        if data is None:
+            data = await config.user(user).all()
         try:
             balance = await bank.get_balance(user)
         except Exception:
@@ -1,24 +1,35 @@
 # -*- coding: utf-8 -*-
 import asyncio
 import contextlib
+import functools
+import itertools
 import logging
 import random
 import time
+from collections import Counter
 from typing import List, Literal, Optional
 
 import discord
 from discord.ext.commands.errors import BadArgument
 from redbot.core import commands
-from redbot.core.i18n import Translator
+from redbot.core.i18n import Translator, get_locale
 from redbot.core.utils.chat_formatting import bold, box, humanize_list, humanize_number, humanize_timedelta
 from redbot.core.utils.predicates import MessagePredicate
 
 from .abc import AdventureMixin
 from .bank import bank
 from .charsheet import Character, Item
-from .constants import HeroClasses, Rarities, Slot
+from .constants import NAZARICK_SETS, SELECTABLE_CLASSES, HeroClasses, Rarities, Slot
 from .converters import HeroClassConverter, ItemConverter
-from .helpers import ConfirmView, escape, is_dev, smart_embed
+from .helpers import (
+    _CLASS_COOLDOWNS,
+    ConfirmView,
+    _ability_cooldown,
+    _insight_roll_range,
+    escape,
+    is_dev,
+    smart_embed,
+)
 from .menus import BackpackMenu, BackpackSource
 
 _ = Translator("Adventure", __file__)
@@ -26,6 +37,28 @@ _ = Translator("Adventure", __file__)
 log = logging.getLogger("red.cogs.adventure")
 
 
+# classes whose forged items or pet are lost when changing away from them
+_LOSE_ON_CHANGE = frozenset({HeroClasses.tinkerer, HeroClasses.ranger})
+# the parts of the saved character a class change reads or writes back
+_CLASS_CHANGE_FIELDS = ("class", "heroclass", "lvl", "rebirths", "skill", "items", "backpack")
+_NAZARICK_SERVANTS = ("Albedo", "Rubedo", "Guardians of Nazarick")
+# backpack items of these rarities can't be used to forge, ascended ones only after 30 rebirths
+_UNFORGEABLE_RARITIES = frozenset({Rarities.forged, Rarities.set, Rarities.event})
+_UNFORGEABLE_RARITIES_UNASCENDED = _UNFORGEABLE_RARITIES | {Rarities.ascended}
+_FORGE_SLOTS = tuple(Slot)
+# rolls needed to expose (physical, magic, diplomacy) weaknesses, with one of them focused on
+_INSIGHT_FOCUS = ((0.4, 0.6, 0.8), (0.8, 0.4, 0.6), (0.8, 0.6, 0.4))
+
+
+@functools.lru_cache(maxsize=None)
+def _available_classes(locale: str) -> str:
+    # class names are translated so the rendered list is cached per locale
+    return box(
+        "\n".join(c.class_colour.as_str(c.class_name) for c in SELECTABLE_CLASSES),
+        lang="ansi",
+    )
+
+
 class ClassAbilities(AdventureMixin):
     """This class will handle class abilities"""
 
@@ -49,10 +82,7 @@ class ClassAbilities(AdventureMixin):
 
         if clz is None:
             ctx.command.reset_cooldown(ctx)
-            classes = box(
-                "\n".join(c.class_colour.as_str(c.class_name) for c in HeroClasses if c is not HeroClasses.hero),
-                lang="ansi",
-            )
+            classes = _available_classes(get_locale())
             await smart_embed(
                 ctx,
                 _(
@@ -68,6 +98,8 @@ class ClassAbilities(AdventureMixin):
                 class_desc = clz.desc()
                 msg = box(clz.class_colour.as_str(class_desc), lang="ansi")
                 return await smart_embed(ctx, msg)
+            author_name = escape(ctx.author.display_name)
+            class_changed = False
             async with self.get_lock(ctx.author):
                 bal = await bank.get_balance(ctx.author)
                 currency_name = await bank.get_currency_name(
@@ -76,8 +108,9 @@ class ClassAbilities(AdventureMixin):
                 if str(currency_name).startswith("<"):
                     currency_name = "credits"
                 spend = round(bal * 0.2)
+                user_data = await self.config.user(ctx.author).all()
                 try:
-                    c = await Character.from_json(ctx, self.config, ctx.author, self._daily_bonus)
+                    c = await Character.from_json(ctx, self.config, ctx.author, self._daily_bonus, data=user_data)
                 except Exception as exc:
                     log.exception("Error with the new character sheet", exc_info=exc)
                     ctx.command.reset_cooldown(ctx)
@@ -95,7 +128,7 @@ class ClassAbilities(AdventureMixin):
                         _("This will cost {spend} {currency_name}. Do you want to continue, {author}?").format(
                             spend=humanize_number(spend),
                             currency_name=currency_name,
-                            author=escape(ctx.author.display_name),
+                            author=author_name,
                         ),
                         lang="ansi",
                     ),
@@ -112,7 +145,7 @@ class ClassAbilities(AdventureMixin):
                     await class_msg.edit(
                         content=box(
                             _("{author} decided to continue being a {h_class}.").format(
-                                author=escape(ctx.author.display_name),
+                                author=author_name,
                                 h_class=current_class.ansi,
                             ),
                             lang="ansi",
@@ -121,22 +154,24 @@ class ClassAbilities(AdventureMixin):
                     )
                     ctx.command.reset_cooldown(ctx)
                     return await self._clear_react(class_msg)
-                if bal < spend:
+                if bal < spend or not await bank.can_spend(ctx.author, spend):
+                    # the balance may have changed while they were deciding
                     await class_msg.edit(content=broke, view=None)
                     ctx.command.reset_cooldown(ctx)
                     return await self._clear_react(class_msg)
-                if not await bank.can_spend(ctx.author, spend):
-                    return await class_msg.edit(content=broke, view=None)
-                try:
-                    c = await Character.from_json(ctx, self.config, ctx.author, self._daily_bonus)
-                except Exception as exc:
-                    log.exception("Error with the new character sheet", exc_info=exc)
-                    return
+                # only rebuild the character if the parts the class change uses were saved while we waited
+                saved_data = await self.config.user(ctx.author).all()
+                if any(saved_data.get(field) != user_data.get(field) for field in _CLASS_CHANGE_FIELDS):
+                    try:
+                        c = await Character.from_json(ctx, self.config, ctx.author, self._daily_bonus, data=saved_data)
+                    except Exception as exc:
+                        log.exception("Error with the new character sheet", exc_info=exc)
+                        return
                 now_class_msg = _("Congratulations, {author}.\nYou are now a {clz}.").format(
-                    author=escape(ctx.author.display_name), clz=clz.ansi
+                    author=author_name, clz=clz.ansi
                 )
                 if c.lvl >= 10:
-                    if current_class in [HeroClasses.tinkerer, HeroClasses.ranger]:
+                    if current_class in _LOSE_ON_CHANGE:
                         view = ConfirmView(60, ctx.author)
                         if current_class is HeroClasses.tinkerer:
                             await self._clear_react(class_msg)
@@ -145,7 +180,7 @@ class ClassAbilities(AdventureMixin):
                                     _(
                                         "{}, you will lose your forged "
                                         "device if you change your class.\nShall I proceed?"
-                                    ).format(escape(ctx.author.display_name)),
+                                    ).format(author_name),
                                     lang="ansi",
                                 ),
                                 view=view,
@@ -155,7 +190,7 @@ class ClassAbilities(AdventureMixin):
                             await class_msg.edit(
                                 content=box(
                                     _("{}, you will lose your pet if you change your class.\nShall I proceed?").format(
-                                        escape(ctx.author.display_name)
+                                        author_name
                                     ),
                                     lang="ansi",
                                 ),
@@ -166,17 +201,11 @@ class ClassAbilities(AdventureMixin):
                             ctx.command.reset_cooldown(ctx)
                             return
                         if view.confirmed:  # user reacted with Yes.
-                            tinker_wep = []
-                            for item in c.get_current_equipment():
-                                if item.rarity is Rarities.forged:
-                                    c = await c.unequip_item(item)
-                            for name, item in c.backpack.items():
-                                if item.rarity is Rarities.forged:
-                                    tinker_wep.append(item)
-                            for item in tinker_wep:
-                                del c.backpack[item.name]
+                            for item in c.get_equipped_by_rarity().get(Rarities.forged, []):
+                                c = await c.unequip_item(item)
+                            tinker_wep = [i for i in c.backpack.values() if i.rarity is Rarities.forged]
+                            c.backpack = {n: i for n, i in c.backpack.items() if i.rarity is not Rarities.forged}
                             if current_class is HeroClasses.tinkerer:
-                                await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
                                 if tinker_wep:
                                     await class_msg.edit(
                                         content=box(
@@ -193,13 +222,10 @@ class ClassAbilities(AdventureMixin):
                                 c.heroclass["pet"] = {}
                                 c.heroclass = clz.to_json()
 
-                                await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
                                 await self._clear_react(class_msg)
                                 await class_msg.edit(
                                     content=box(
-                                        _("{} released their pet into the wild.\n").format(
-                                            escape(ctx.author.display_name)
-                                        ),
+                                        _("{} released their pet into the wild.\n").format(author_name),
                                         lang="ansi",
                                     ),
                                     view=None,
@@ -209,9 +235,7 @@ class ClassAbilities(AdventureMixin):
                             await self._clear_react(class_msg)
                             await class_msg.edit(
                                 content=box(
-                                    _("{}, you will remain a {}").format(
-                                        escape(ctx.author.display_name), c.hc.class_name
-                                    ),
+                                    _("{}, you will remain a {}").format(author_name, c.hc.class_name),
                                     lang="ansi",
                                 ),
                                 view=None,
@@ -221,28 +245,19 @@ class ClassAbilities(AdventureMixin):
                     if c.skill["pool"] < 0:
                         c.skill["pool"] = 0
                     c.heroclass = clz.to_json()
-                    if c.hc in [HeroClasses.wizard, HeroClasses.cleric]:
-                        c.heroclass["cooldown"] = max(300, (1200 - max((c.luck + c.total_int) * 2, 0))) + time.time()
-                    elif c.hc is HeroClasses.ranger:
-                        c.heroclass["cooldown"] = max(1800, (7200 - max(c.luck * 2 + c.total_int * 2, 0))) + time.time()
-                        c.heroclass["catch_cooldown"] = (
-                            max(600, (3600 - max(c.luck * 2 + c.total_int * 2, 0))) + time.time()
-                        )
-                    elif c.hc is HeroClasses.berserker:
-                        c.heroclass["cooldown"] = max(300, (1200 - max((c.luck + c.total_att) * 2, 0))) + time.time()
-                    elif c.hc is HeroClasses.bard:
-                        c.heroclass["cooldown"] = max(300, (1200 - max((c.luck + c.total_cha) * 2, 0))) + time.time()
-                    elif c.hc is HeroClasses.tinkerer:
-                        c.heroclass["cooldown"] = max(900, (3600 - max((c.luck + c.total_int) * 2, 0))) + time.time()
-                    elif c.hc is HeroClasses.psychic:
-                        c.heroclass["cooldown"] = max(300, (900 - max((c.luck - c.total_cha) * 2, 0))) + time.time()
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
-                    await self._clear_react(class_msg)
-                    await class_msg.edit(content=box(now_class_msg, lang="ansi"), view=None)
+                    if c.hc in _CLASS_COOLDOWNS:
+                        cooldown, catch_cooldown = _CLASS_COOLDOWNS[c.hc](c)
+                        now = time.time()
+                        c.heroclass["cooldown"] = cooldown + now
+                        if catch_cooldown is not None:
+                            c.heroclass["catch_cooldown"] = catch_cooldown + now
                     try:
                         await bank.withdraw_credits(ctx.author, spend)
                     except ValueError:
+                        ctx.command.reset_cooldown(ctx)
                         return await class_msg.edit(content=broke, view=None)
+                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    class_changed = True
                 else:
                     ctx.command.reset_cooldown(ctx)
                     await smart_embed(
@@ -251,6 +266,12 @@ class ClassAbilities(AdventureMixin):
                             user=bold(ctx.author.display_name)
                         ),
                     )
+            if class_changed:
+                # the character is saved so the lock isn't held while we wait on Discord
+                await asyncio.gather(
+                    self._clear_react(class_msg),
+                    class_msg.edit(content=box(now_class_msg, lang="ansi"), view=None),
+                )
 
     @commands.hybrid_group(autohelp=False, fallback="find")
     @commands.cooldown(rate=1, per=5, type=commands.BucketType.user)
@@ -276,22 +297,24 @@ class ClassAbilities(AdventureMixin):
                         ctx,
                         _("{user}, you need to be a Ranger to do this.").format(user=bold(ctx.author.display_name)),
                     )
+                author_name = escape(ctx.author.display_name)
                 if c.heroclass["pet"]:
                     ctx.command.reset_cooldown(ctx)
                     return await ctx.send(
                         box(
                             _("{author}, you already have a pet. Try foraging ({prefix}pet forage).").format(
-                                author=escape(ctx.author.display_name), prefix=ctx.clean_prefix
+                                author=author_name, prefix=ctx.clean_prefix
                             ),
                             lang="ansi",
                         )
                     )
                 else:
-                    cooldown_time = max(600, (3600 - max((c.luck + c.total_int) * 2, 0)))
+                    cooldown_time = _CLASS_COOLDOWNS[HeroClasses.ranger](c)[1]
                     if "catch_cooldown" not in c.heroclass:
                         c.heroclass["catch_cooldown"] = cooldown_time + 1
-                    if c.heroclass["catch_cooldown"] > time.time():
-                        cooldown_time = c.heroclass["catch_cooldown"] - time.time()
+                    now = time.time()
+                    if c.heroclass["catch_cooldown"] > now:
+                        cooldown_time = c.heroclass["catch_cooldown"] - now
                         return await smart_embed(
                             ctx,
                             _(
@@ -303,11 +326,8 @@ class ClassAbilities(AdventureMixin):
                                 else _("1 second")
                             ),
                         )
-                    theme = await self.config.theme()
-                    extra_pets = await self.config.themes.all()
-                    extra_pets = extra_pets.get(theme, {}).get("pets", {})
-                    pet_list = {**self.PETS, **extra_pets}
-                    pet_choices = list(pet_list.keys())
+                    pet_list = await self.get_pet_list()
+                    pet_choices = self._pet_choices
                     pet = random.choice(pet_choices)
                     roll = random.randint(1, 50)
                     dipl_value = c.total_cha + (c.total_int // 3) + (c.luck // 2)
@@ -315,17 +335,14 @@ class ClassAbilities(AdventureMixin):
                     pet_msg4 = ""
                     can_catch = True
                     force_catch = False
-                    if any(x in c.sets for x in ["The Supreme One", "Ainz Ooal Gown"]):
+                    if not NAZARICK_SETS.isdisjoint(c.sets):
                         can_catch = True
-                        pet = random.choice(
-                            [
-                                "Albedo",
-                                "Rubedo",
-                                "Guardians of Nazarick",
-                                *random.choices(pet_choices, k=10),
-                            ]
-                        )
-                        if pet in ["Albedo", "Rubedo", "Guardians of Nazarick"]:
+                        # each servant has a 1 in 13 chance, otherwise any pet can show up
+                        if random.random() < 3 / 13:
+                            pet = random.choice(_NAZARICK_SERVANTS)
+                        else:
+                            pet = random.choice(pet_choices)
+                        if pet in _NAZARICK_SERVANTS:
                             force_catch = True
                     elif pet_reqs.get("bonuses", {}).get("req"):
                         if pet_reqs.get("set", None) in c.sets:
@@ -334,80 +351,56 @@ class ClassAbilities(AdventureMixin):
                             can_catch = False
                             pet_msg4 = _("\nPerhaps you're missing some requirements to tame {pet}.").format(pet=pet)
                     pet_msg = box(
-                        _("{c} is trying to tame a pet.").format(c=escape(ctx.author.display_name)),
+                        _("{c} is trying to tame a pet.").format(c=author_name),
                         lang="ansi",
                     )
-                    user_msg = await ctx.send(pet_msg)
-                    await asyncio.sleep(2)
                     pet_msg2 = box(
                         _("{author} started tracking a wild {pet_name} with a roll of {dice}({roll}).").format(
                             dice=self.emojis.dice,
-                            author=escape(ctx.author.display_name),
+                            author=author_name,
                             pet_name=pet,
                             roll=roll,
                         ),
                         lang="ansi",
                     )
-                    await user_msg.edit(content=f"{pet_msg}\n{pet_msg2}")
-                    await asyncio.sleep(2)
                     bonus = ""
                     if roll == 1:
                         bonus = _("But they stepped on a twig and scared it away.")
                     elif roll in [50, 25]:
                         bonus = _("They happen to have its favorite food.")
+                    outcome = None
                     if force_catch or (dipl_value > pet_list[pet]["cha"] and roll > 1 and can_catch):
-                        if force_catch:
-                            roll = 0
-                        else:
-                            roll = random.randint(0, (2 if roll in [50, 25] else 5))
+                        roll = 0 if force_catch else random.randint(0, (2 if roll in [50, 25] else 5))
                         if roll == 0:
-                            if force_catch and any(x in c.sets for x in ["The Supreme One", "Ainz Ooal Gown"]):
-                                msg = random.choice(
+                            if force_catch:
+                                outcome = random.choice(
                                     [
                                         _("{author} commands {pet} into submission.").format(
-                                            pet=pet, author=escape(ctx.author.display_name)
+                                            pet=pet, author=author_name
                                         ),
                                         _("{pet} swears allegiance to the Supreme One.").format(
-                                            pet=pet, author=escape(ctx.author.display_name)
+                                            pet=pet, author=author_name
                                         ),
                                         _("{pet} takes an Oath of Allegiance to the Supreme One.").format(
-                                            pet=pet, author=escape(ctx.author.display_name)
+                                            pet=pet, author=author_name
                                         ),
                                     ]
                                 )
-                                pet_msg3 = box(
-                                    msg,
-                                    lang="ansi",
-                                )
                             else:
-                                pet_msg3 = box(
-                                    _("{bonus}\nThey successfully tamed the {pet}.").format(bonus=bonus, pet=pet),
-                                    lang="ansi",
-                                )
-                            await user_msg.edit(content=f"{pet_msg}\n{pet_msg2}\n{pet_msg3}")
+                                outcome = _("{bonus}\nThey successfully tamed the {pet}.").format(bonus=bonus, pet=pet)
+                            pet_msg4 = ""
                             c.heroclass["pet"] = pet_list[pet]
                             c.heroclass["catch_cooldown"] = time.time() + cooldown_time
                             await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
-                        elif roll == 1:
-                            bonus = _("But they stepped on a twig and scared it away.")
-                            pet_msg3 = box(
-                                _("{bonus}\nThe {pet} escaped.").format(bonus=bonus, pet=pet),
-                                lang="ansi",
-                            )
-                            await user_msg.edit(content=f"{pet_msg}\n{pet_msg2}\n{pet_msg3}{pet_msg4}")
                         else:
-                            bonus = ""
-                            pet_msg3 = box(
-                                _("{bonus}\nThe {pet} escaped.").format(bonus=bonus, pet=pet),
-                                lang="ansi",
-                            )
-                            await user_msg.edit(content=f"{pet_msg}\n{pet_msg2}\n{pet_msg3}{pet_msg4}")
-                    else:
-                        pet_msg3 = box(
-                            _("{bonus}\nThe {pet} escaped.").format(bonus=bonus, pet=pet),
-                            lang="ansi",
-                        )
-                        await user_msg.edit(content=f"{pet_msg}\n{pet_msg2}\n{pet_msg3}{pet_msg4}")
+                            bonus = _("But they stepped on a twig and scared it away.") if roll == 1 else ""
+                    if outcome is None:
+                        outcome = _("{bonus}\nThe {pet} escaped.").format(bonus=bonus, pet=pet)
+            # the outcome is already saved so the lock isn't held while the hunt plays out
+            base = f"{pet_msg}\n{pet_msg2}"
+            user_msg = await ctx.send(base)
+            await asyncio.sleep(2)
+            await user_msg.edit(content="\n".join((base, box(outcome, lang="ansi") + pet_msg4)))
 
     @pet.command(name="forage")
     @commands.bot_has_permissions(add_reactions=True)
@@ -433,7 +426,7 @@ class ClassAbilities(AdventureMixin):
                     _("{author}, Your backpack is currently full.").format(author=bold(ctx.author.display_name))
                 )
                 return
-            cooldown_time = max(1800, (7200 - max((c.luck + c.total_int) * 2, 0)))
+            cooldown_time = _CLASS_COOLDOWNS[HeroClasses.ranger](c)[0]
             if "cooldown" not in c.heroclass:
                 c.heroclass["cooldown"] = cooldown_time + 1
             if c.heroclass["cooldown"] <= time.time():
@@ -497,12 +490,13 @@ class ClassAbilities(AdventureMixin):
                         ctx,
                         _("{user}, ability already in use.").format(user=bold(ctx.author.display_name)),
                     )
-                cooldown_time = max(300, (1200 - max((c.luck + c.total_int) * 2, 0)))
+                cooldown_time = _CLASS_COOLDOWNS[HeroClasses.cleric](c)[0]
                 if "cooldown" not in c.heroclass:
                     c.heroclass["cooldown"] = cooldown_time + 1
-                if c.heroclass["cooldown"] <= time.time():
+                now = time.time()
+                if c.heroclass["cooldown"] <= now:
                     c.heroclass["ability"] = True
-                    c.heroclass["cooldown"] = time.time() + cooldown_time
+                    c.heroclass["cooldown"] = now + cooldown_time
                     await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
 
                     await smart_embed(
@@ -541,7 +535,8 @@ class ClassAbilities(AdventureMixin):
                 _("{user}, you need to be a Psychic to do this.").format(user=bold(ctx.author.display_name)),
             )
         else:
-            if ctx.guild.id not in self._sessions:
+            session = self._sessions.get(ctx.guild.id)
+            if session is None:
                 return await smart_embed(
                     ctx,
                     _("There are no active adventures."),
@@ -556,31 +551,36 @@ class ClassAbilities(AdventureMixin):
                     ctx,
                     _("{user}, ability already in use.").format(user=bold(ctx.author.display_name)),
                 )
-            cooldown_time = max(300, (900 - max((c.luck + c.total_cha) * 2, 0)))
+            cooldown_time = _ability_cooldown(c, 300, 900, c.total_cha)
             if "cooldown" not in c.heroclass:
                 c.heroclass["cooldown"] = cooldown_time + 1
-            if c.heroclass["cooldown"] <= time.time():
-                max_roll = 100 if c.rebirths >= 30 else 50 if c.rebirths >= 15 else 20
-                roll = random.randint(min(c.rebirths - 25 // 2, (max_roll // 2)), max_roll) / max_roll
-                if ctx.guild.id in self._sessions and self._sessions[ctx.guild.id].insight[0] < roll:
-                    self._sessions[ctx.guild.id].insight = roll, c
+            now = time.time()
+            if c.heroclass["cooldown"] <= now:
+                min_roll, max_roll = _insight_roll_range(c.rebirths)
+                roll = random.randint(min_roll, max_roll) / max_roll
+                if session.insight[0] < roll:
+                    session.insight = roll, c
                     good = True
                 else:
                     good = False
                     await smart_embed(ctx, _("Another hero has already done a better job than you."))
                 c.heroclass["ability"] = True
-                c.heroclass["cooldown"] = time.time() + cooldown_time
+                c.heroclass["cooldown"] = now + cooldown_time
                 async with self.get_lock(c.user):
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    character_data = await c.to_json(ctx, self.config)
                     if good:
-                        await smart_embed(
-                            ctx,
-                            _("{skill} {c} is focusing on the monster ahead...{skill}").format(
-                                c=bold(ctx.author.display_name),
-                                skill=self.emojis.skills.psychic,
+                        await asyncio.gather(
+                            self.config.user(ctx.author).set(character_data),
+                            smart_embed(
+                                ctx,
+                                _("{skill} {c} is focusing on the monster ahead...{skill}").format(
+                                    c=bold(ctx.author.display_name),
+                                    skill=self.emojis.skills.psychic,
+                                ),
                             ),
                         )
-                session = self._sessions[ctx.guild.id]
+                    else:
+                        await self.config.user(ctx.author).set(character_data)
                 was_exposed = not session.exposed
                 if good:
 
@@ -591,24 +591,11 @@ class ClassAbilities(AdventureMixin):
                         if roll >= 0.4:
                             msg += _("You are struggling to find anything in your current adventure.")
                     else:
-                        pdef = session.monster_modified_stats["pdef"]
-                        mdef = session.monster_modified_stats["mdef"]
-                        cdef = session.monster_modified_stats.get("cdef", 1.0)
-                        hp = session.monster_modified_stats["hp"]
-                        dipl = session.monster_modified_stats["dipl"]
-                        choice = random.choice(["physical", "magic", "diplomacy"])
-                        if choice == "physical":
-                            physical_roll = 0.4
-                            magic_roll = 0.6
-                            diplo_roll = 0.8
-                        elif choice == "magic":
-                            physical_roll = 0.8
-                            magic_roll = 0.4
-                            diplo_roll = 0.6
-                        else:
-                            physical_roll = 0.8
-                            magic_roll = 0.6
-                            diplo_roll = 0.4
+                        monster_stats = session.monster_modified_stats
+                        pdef = monster_stats["pdef"]
+                        mdef = monster_stats["mdef"]
+                        cdef = monster_stats.get("cdef", 1.0)
+                        physical_roll, magic_roll, diplo_roll = random.choice(_INSIGHT_FOCUS)
 
                         if roll == 1:
                             hp = session.monster_hp()
@@ -626,7 +613,6 @@ class ClassAbilities(AdventureMixin):
                                 if session.transcended
                                 else f"{self.emojis.skills.psychic}",
                             )
-                            self._sessions[ctx.guild.id].exposed = True
                         elif roll >= 0.95:
                             hp = session.monster_hp()
                             dipl = session.monster_dipl()
@@ -640,7 +626,6 @@ class ClassAbilities(AdventureMixin):
                                 dipl_symbol=self.emojis.dipl,
                                 dipl=humanize_number(int(dipl)),
                             )
-                            self._sessions[ctx.guild.id].exposed = True
                         elif roll >= 0.90:
                             hp = session.monster_hp()
                             msg += _("This monster is **a{attr} {challenge}** ({hp_symbol} {hp}).\n").format(
@@ -649,18 +634,17 @@ class ClassAbilities(AdventureMixin):
                                 hp_symbol=self.emojis.hp,
                                 hp=humanize_number(int(hp)),
                             )
-                            self._sessions[ctx.guild.id].exposed = True
                         elif roll > 0.75:
                             msg += _("This monster is **a{attr} {challenge}**.\n").format(
                                 challenge=session.challenge,
                                 attr=session.attribute,
                             )
-                            self._sessions[ctx.guild.id].exposed = True
                         elif roll > 0.5:
                             msg += _("This monster is **a {challenge}**.\n").format(
                                 challenge=session.challenge,
                             )
-                            self._sessions[ctx.guild.id].exposed = True
+                        if roll > 0.5:
+                            session.exposed = True
 
                         if roll >= physical_roll:
                             if pdef >= 1.5:
@@ -719,54 +703,60 @@ class ClassAbilities(AdventureMixin):
                     ).format(f"<t:{cooldown_time}:R>"),
                 )
 
-    @commands.hybrid_command()
-    async def rage(self, ctx: commands.Context):
-        """[Berserker Class Only]
-
-        This allows a Berserker to add substantial attack bonuses for one battle.
-        """
+    async def _use_class_ability(
+        self,
+        ctx: commands.Context,
+        hero_class: HeroClasses,
+        skill: str,
+        wrong_class_msg: str,
+        activated_msg: str,
+        cooldown_msg: str,
+    ):
         async with self.get_lock(ctx.author):
             try:
                 c = await Character.from_json(ctx, self.config, ctx.author, self._daily_bonus)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
-            if c.hc is not HeroClasses.berserker:
+            if c.hc is not hero_class:
                 ctx.command.reset_cooldown(ctx)
+                return await smart_embed(ctx, wrong_class_msg.format(user=bold(ctx.author.display_name)))
+            if c.heroclass["ability"]:
                 return await smart_embed(
                     ctx,
-                    _("{user}, you need to be a Berserker to do this.").format(user=bold(ctx.author.display_name)),
+                    _("{user}, ability already in use.").format(user=bold(ctx.author.display_name)),
                 )
+            cooldown_time = _CLASS_COOLDOWNS[hero_class](c)[0]
+            if "cooldown" not in c.heroclass:
+                c.heroclass["cooldown"] = cooldown_time + 1
+            now = time.time()
+            if c.heroclass["cooldown"] <= now:
+                c.heroclass["ability"] = True
+                c.heroclass["cooldown"] = now + cooldown_time
+                await self.config.user(ctx.author).set_raw("heroclass", value=c.heroclass)
+                await smart_embed(ctx, activated_msg.format(c=bold(ctx.author.display_name), skill=skill))
             else:
-                if c.heroclass["ability"] is True:
-                    return await smart_embed(
-                        ctx,
-                        _("{user}, ability already in use.").format(user=bold(ctx.author.display_name)),
-                    )
-                cooldown_time = max(300, (1200 - max((c.luck + c.total_att) * 2, 0)))
-                if "cooldown" not in c.heroclass:
-                    c.heroclass["cooldown"] = cooldown_time + 1
-                if c.heroclass["cooldown"] <= time.time():
-                    c.heroclass["ability"] = True
-                    c.heroclass["cooldown"] = time.time() + cooldown_time
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
-                    await smart_embed(
-                        ctx,
-                        _("{skill} {c} is starting to froth at the mouth... {skill}").format(
-                            c=bold(ctx.author.display_name),
-                            skill=self.emojis.skills.berserker,
-                        ),
-                    )
-                else:
-                    cooldown_time = int(c.heroclass["cooldown"])
-                    return await smart_embed(
-                        ctx,
-                        _(
-                            "Your hero is currently recovering from the last time "
-                            "they used this skill or they have just changed their heroclass. "
-                            "Try again in {}."
-                        ).format(f"<t:{cooldown_time}:R>"),
-                    )
+                cooldown_time = int(c.heroclass["cooldown"])
+                return await smart_embed(ctx, cooldown_msg.format(f"<t:{cooldown_time}:R>"))
+
+    @commands.hybrid_command()
+    async def rage(self, ctx: commands.Context):
+        """[Berserker Class Only]
+
+        This allows a Berserker to add substantial attack bonuses for one battle.
+        """
+        return await self._use_class_ability(
+            ctx,
+            HeroClasses.berserker,
+            self.emojis.skills.berserker,
+            _("{user}, you need to be a Berserker to do this."),
+            _("{skill} {c} is starting to froth at the mouth... {skill}"),
+            _(
+                "Your hero is currently recovering from the last time "
+                "they used this skill or they have just changed their heroclass. "
+                "Try again in {}."
+            ),
+        )
 
     @commands.hybrid_command()
     async def focus(self, ctx: commands.Context):
@@ -774,48 +764,14 @@ class ClassAbilities(AdventureMixin):
 
         This allows a Wizard to add substantial magic bonuses for one battle.
         """
-        async with self.get_lock(ctx.author):
-            try:
-                c = await Character.from_json(ctx, self.config, ctx.author, self._daily_bonus)
-            except Exception as exc:
-                log.exception("Error with the new character sheet", exc_info=exc)
-                return
-            if c.hc is not HeroClasses.wizard:
-                ctx.command.reset_cooldown(ctx)
-                return await smart_embed(
-                    ctx,
-                    _("{user}, you need to be a Wizard to do this.").format(user=bold(ctx.author.display_name)),
-                )
-            else:
-                if c.heroclass["ability"] is True:
-                    return await smart_embed(
-                        ctx,
-                        _("{user}, ability already in use.").format(user=bold(ctx.author.display_name)),
-                    )
-                cooldown_time = max(300, (1200 - max((c.luck + c.total_int) * 2, 0)))
-                if "cooldown" not in c.heroclass:
-                    c.heroclass["cooldown"] = cooldown_time + 1
-                if c.heroclass["cooldown"] <= time.time():
-                    c.heroclass["ability"] = True
-                    c.heroclass["cooldown"] = time.time() + cooldown_time
-
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
-                    await smart_embed(
-                        ctx,
-                        _("{skill} {c} is focusing all of their energy... {skill}").format(
-                            c=bold(ctx.author.display_name),
-                            skill=self.emojis.skills.wizzard,
-                        ),
-                    )
-                else:
-                    cooldown_time = int(c.heroclass["cooldown"])
-                    return await smart_embed(
-                        ctx,
-                        _(
-                            "Your hero is currently recovering from the "
-                            "last time they used this skill. Try again in {}."
-                        ).format(f"<t:{cooldown_time}:R>"),
-                    )
+        return await self._use_class_ability(
+            ctx,
+            HeroClasses.wizard,
+            self.emojis.skills.wizzard,
+            _("{user}, you need to be a Wizard to do this."),
+            _("{skill} {c} is focusing all of their energy... {skill}"),
+            _("Your hero is currently recovering from the last time they used this skill. Try again in {}."),
+        )
 
     @commands.hybrid_command()
     async def music(self, ctx: commands.Context):
@@ -823,47 +779,18 @@ class ClassAbilities(AdventureMixin):
 
         This allows a Bard to add substantial diplomacy bonuses for one battle.
         """
-        async with self.get_lock(ctx.author):
-            try:
-                c = await Character.from_json(ctx, self.config, ctx.author, self._daily_bonus)
-            except Exception as exc:
-                log.exception("Error with the new character sheet", exc_info=exc)
-                return
-            if c.hc is not HeroClasses.bard:
-                ctx.command.reset_cooldown(ctx)
-                return await smart_embed(
-                    ctx,
-                    _("{user}, you need to be a Bard to do this.").format(user=bold(ctx.author.display_name)),
-                )
-            else:
-                if c.heroclass["ability"]:
-                    return await smart_embed(
-                        ctx,
-                        _("{user}, ability already in use.").format(user=bold(ctx.author.display_name)),
-                    )
-                cooldown_time = max(300, (1200 - max((c.luck + c.total_cha) * 2, 0)))
-                if "cooldown" not in c.heroclass:
-                    c.heroclass["cooldown"] = cooldown_time + 1
-                if c.heroclass["cooldown"] <= time.time():
-                    c.heroclass["ability"] = True
-                    c.heroclass["cooldown"] = time.time() + cooldown_time
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
-                    await smart_embed(
-                        ctx,
-                        _("{skill} {c} is whipping up a performance... {skill}").format(
-                            c=bold(ctx.author.display_name), skill=self.emojis.skills.bard
-                        ),
-                    )
-                else:
-                    cooldown_time = int(c.heroclass["cooldown"])
-                    return await smart_embed(
-                        ctx,
-                        _(
-                            "Your hero is currently recovering from the last time "
-                            "they used this skill or they have just changed their heroclass. "
-                            "Try again in {}."
-                        ).format(f"<t:{cooldown_time}:R>"),
-                    )
+        return await self._use_class_ability(
+            ctx,
+            HeroClasses.bard,
+            self.emojis.skills.bard,
+            _("{user}, you need to be a Bard to do this."),
+            _("{skill} {c} is whipping up a performance... {skill}"),
+            _(
+                "Your hero is currently recovering from the last time "
+                "they used this skill or they have just changed their heroclass. "
+                "Try again in {}."
+            ),
+        )
 
     @commands.max_concurrency(1, per=commands.BucketType.user)
     @commands.hybrid_command()
@@ -889,7 +816,7 @@ class ClassAbilities(AdventureMixin):
                     _("{}, you need to be a Tinkerer to do this.").format(bold(ctx.author.display_name)),
                 )
             else:
-                cooldown_time = max(1800, (7200 - max((c.luck + c.total_int) * 2, 0)))
+                cooldown_time = _ability_cooldown(c, 1800, 7200, c.total_int)
                 if "cooldown" not in c.heroclass:
                     c.heroclass["cooldown"] = cooldown_time + 1
                 if c.heroclass["cooldown"] > time.time():
@@ -899,13 +826,14 @@ class ClassAbilities(AdventureMixin):
                         _("This command is on cooldown. Try again in {}").format(f"<t:{cooldown_time}:R>"),
                     )
                 ascended_forge_msg = ""
-                ignored_rarities = {Rarities.forged, Rarities.set, Rarities.event}
+                ignored_rarities = _UNFORGEABLE_RARITIES
                 if c.rebirths < 30:
-                    ignored_rarities.add(Rarities.ascended)
+                    ignored_rarities = _UNFORGEABLE_RARITIES_UNASCENDED
                     ascended_forge_msg += _("\n\nAscended items will be forgeable after 30 rebirths.")
                 consumed = []
-                forgeables_items = [str(i) for n, i in c.backpack.items() if i.rarity not in ignored_rarities]
-                if len(forgeables_items) <= 1:
+                # only whether there are at least two matters here, so stop looking once they're found
+                forgeables = (i for i in c.backpack.values() if i.rarity not in ignored_rarities)
+                if len(list(itertools.islice(forgeables, 2))) < 2:
                     return await smart_embed(
                         ctx,
                         _("{}, you need at least two forgeable items in your backpack to forge.{}").format(
@@ -938,24 +866,26 @@ class ClassAbilities(AdventureMixin):
                     timeout_msg = _("I don't have all day you know, {}.").format(bold(ctx.author.display_name))
                     return await smart_embed(ctx, timeout_msg)
                 newitem, roll = await self._to_forge(ctx, consumed, c)
+                tally = Counter(x.name for x in consumed)
                 for x in consumed:
-                    if x.name not in c.backpack:
+                    if x.name not in c.backpack or c.backpack[x.name].owned < tally[x.name]:
                         return await smart_embed(
+                            ctx,
                             message=box(
                                 _(
                                     "I don't know what you're playing at but {item} is no longer in your backpack."
                                 ).format(item=x.as_ansi()),
                                 lang="ansi",
-                            )
+                            ),
                         )
-                    c.backpack[x.name].owned -= 1
-                    if c.backpack[x.name].owned <= 0:
-                        del c.backpack[x.name]
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                for name, count in tally.items():
+                    c.backpack[name].owned -= count
+                    if c.backpack[name].owned <= 0:
+                        del c.backpack[name]
                 # save so the items are eaten up already
-                for item in c.get_current_equipment():
-                    if item.rarity is Rarities.forged:
-                        c = await c.unequip_item(item)
+                await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                for item in c.get_equipped_by_rarity().get(Rarities.forged, []):
+                    c = await c.unequip_item(item)
                 lookup = list(i for n, i in c.backpack.items() if i.rarity is Rarities.forged)
                 msg = _(
                     "{author}, your forging roll was {dice}({roll}).\nThe device you tinkered will have the following stats.\n"
@@ -963,10 +893,11 @@ class ClassAbilities(AdventureMixin):
 
                 msg += box(str(newitem.table(c)), lang="ansi")
                 if len(lookup) > 0:
+                    replaced = ", ".join([x.as_ansi() for x in lookup])
                     msg += box(
                         _("{author}, you already have a device. Do you want to replace {replace}?").format(
                             author=escape(ctx.author.display_name),
-                            replace=", ".join([x.as_ansi() for x in lookup]),
+                            replace=replaced,
                         ),
                         lang="ansi",
                     )
@@ -981,25 +912,31 @@ class ClassAbilities(AdventureMixin):
                             _("{author}, your new {newitem} consumed {lk} and is now lurking in your backpack.").format(
                                 author=escape(ctx.author.display_name),
                                 newitem=newitem.as_ansi(),
-                                lk=", ".join([x.as_ansi() for x in lookup]),
+                                lk=replaced,
                             ),
                             lang="ansi",
                         )
                         for item in lookup:
                             del c.backpack[item.name]
-                        await view.message.edit(content=created_item, view=None)
                         c.backpack[newitem.name] = newitem
-                        await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                        character_data = await c.to_json(ctx, self.config)
+                        await asyncio.gather(
+                            self.config.user(ctx.author).set(character_data),
+                            view.message.edit(content=created_item, view=None),
+                        )
                     else:
                         c.heroclass["cooldown"] = time.time() + cooldown_time
-                        await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                        character_data = await c.to_json(ctx, self.config)
                         mad_forge = box(
                             _("{author}, {newitem} got mad at your rejection and blew itself up.").format(
                                 author=escape(ctx.author.display_name), newitem=newitem.as_ansi()
                             ),
                             lang="ansi",
                         )
-                        return await view.message.edit(content=mad_forge, view=None)
+                        await asyncio.gather(
+                            self.config.user(ctx.author).set(character_data),
+                            view.message.edit(content=mad_forge, view=None),
+                        )
                 else:
                     msg += _("Do you want to keep this item?")
                     view = ConfirmView(60, ctx.author, get_name=True)
@@ -1010,33 +947,39 @@ class ClassAbilities(AdventureMixin):
                     if view.confirmed:
                         c.heroclass["cooldown"] = time.time() + cooldown_time
                         c.backpack[newitem.name] = newitem
-                        await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                        character_data = await c.to_json(ctx, self.config)
                         forged_item = box(
                             _("{author}, your new {newitem} is lurking in your backpack.").format(
                                 author=escape(ctx.author.display_name), newitem=newitem.as_ansi()
                             ),
                             lang="ansi",
                         )
-                        await view.message.edit(content=forged_item, view=None)
+                        await asyncio.gather(
+                            self.config.user(ctx.author).set(character_data),
+                            view.message.edit(content=forged_item, view=None),
+                        )
                     else:
                         c.heroclass["cooldown"] = time.time() + cooldown_time
-                        await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                        character_data = await c.to_json(ctx, self.config)
                         mad_forge = box(
                             _("{author}, {newitem} got mad at your rejection and blew itself up.").format(
                                 author=escape(ctx.author.display_name), newitem=newitem.as_ansi()
                             ),
                             lang="ansi",
                         )
-                        return await view.message.edit(content=mad_forge, view=None)
+                        await asyncio.gather(
+                            self.config.user(ctx.author).set(character_data),
+                            view.message.edit(content=mad_forge, view=None),
+                        )
 
     async def get_forge_items(self, ctx: commands.Context, c: Character):
         ascended_forge_msg = ""
-        ignored_rarities = [Rarities.forged, Rarities.set, Rarities.event]
+        ignored_rarities = _UNFORGEABLE_RARITIES
         if c.rebirths < 30:
-            ignored_rarities.append(Rarities.ascended)
+            ignored_rarities = _UNFORGEABLE_RARITIES_UNASCENDED
             ascended_forge_msg += _("\n\nAscended items will be forgeable after 30 rebirths.")
         consumed = []
-        forgeables_items = [str(i) for n, i in c.backpack.items() if i.rarity not in ignored_rarities]
+        forgeable_names = {n for n, i in c.backpack.items() if i.rarity not in ignored_rarities}
         await smart_embed(
             ctx,
             _(
@@ -1060,7 +1003,7 @@ class ClassAbilities(AdventureMixin):
                 with contextlib.suppress(BadArgument):
                     item = None
                     item = await ItemConverter().convert(new_ctx, reply.content)
-                    if str(item) not in forgeables_items:
+                    if item.name not in forgeable_names:
                         item = None
 
                 if not item:
@@ -1093,28 +1036,20 @@ class ClassAbilities(AdventureMixin):
 
         roll = random.randint(1, 20)
         modifier = (roll / 20) + 0.75
-        base_cha = max(character._cha, 1)
-        base_int = character._int
-        base_luck = character._luck
-        base_att = max(character._att, 1)
-        modifier_bonus_luck = 0.01 * (base_luck // 10)
-        modifier_bonus_int = 0.01 * (base_int // 20)
-        modifier_penalty_str = 0.01 * (base_att // 20)
-        modifier_penalty_cha = 0.01 * (base_cha // 20)
-        modifier = sum([modifier_bonus_int, modifier_bonus_luck, modifier_penalty_cha, modifier_penalty_str, modifier])
+        char_cha = max(character._cha, 1)
+        char_int = character._int
+        char_luck = character._luck
+        char_att = max(character._att, 1)
+        modifier_bonus_luck = 0.01 * (char_luck // 10)
+        modifier_bonus_int = 0.01 * (char_int // 20)
+        modifier_penalty_str = 0.01 * (char_att // 20)
+        modifier_penalty_cha = 0.01 * (char_cha // 20)
+        modifier = sum((modifier_bonus_int, modifier_bonus_luck, modifier_penalty_cha, modifier_penalty_str, modifier))
         modifier = max(0.001, modifier)
 
-        base_int = int(item1.int) + int(item2.int)
-        base_cha = int(item1.cha) + int(item2.cha)
-        base_att = int(item1.att) + int(item2.att)
-        base_dex = int(item1.dex) + int(item2.dex)
-        base_luck = int(item1.luck) + int(item2.luck)
-        newatt = int((base_att * modifier) + base_att)
-        newdip = int((base_cha * modifier) + base_cha)
-        newint = int((base_int * modifier) + base_int)
-        newdex = int((base_dex * modifier) + base_dex)
-        newluck = int((base_luck * modifier) + base_luck)
-        newslot = random.choice([i for i in Slot])
+        bases = (int(getattr(item1, stat)) + int(getattr(item2, stat)) for stat in ("att", "cha", "int", "dex", "luck"))
+        newatt, newdip, newint, newdex, newluck = (int((base * modifier) + base) for base in bases)
+        newslot = random.choice(_FORGE_SLOTS)
 
         item = {
             _("Unnamed Artifact"): {
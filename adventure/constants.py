@@ -638,7 +638,12 @@ class HeroClasses(Enum):
         return ret
 
 
-DEV_LIST = (208903205982044161, 154497072148643840, 218773382617890828)
+# classes a player can choose with the heroclass command
+SELECTABLE_CLASSES = tuple(c for c in HeroClasses if c is not HeroClasses.hero)
+
+NAZARICK_SETS = frozenset({"The Supreme One", "Ainz Ooal Gown"})
+
+DEV_LIST = frozenset({208903205982044161, 154497072148643840, 218773382617890828})
 ORDER = [
     "head",
     "neck",
@@ -24,7 +24,7 @@ from redbot.core.utils.predicates import ReactionPredicate
 
 from .charsheet import Character, Item
 from .constants import DEV_LIST, HeroClasses, Rarities, Skills, Slot
-from .helpers import smart_embed
+from .helpers import AuthorOnlyView, smart_embed
 
 log = logging.getLogger("red.cogs.adventure")
 
@@ -301,19 +301,12 @@ class ItemButton(discord.ui.Button):
         await interaction.response.edit_message(view=None)
 
 
-class ConfirmItemView(discord.ui.View):
+class ConfirmItemView(AuthorOnlyView):
     def __init__(self, timeout: float, items: List[Item], author: discord.User):
-        super().__init__(timeout=timeout)
+        super().__init__(timeout, author)
         self.selected_item = None
         for item in items:
             self.add_item(ItemButton(item))
-        self.author = author
-
-    async def interaction_check(self, interaction: discord.Interaction):
-        if interaction.user.id != self.author.id:
-            await interaction.response.send_message(_("You are not authorized to interact with this."), ephemeral=True)
-            return False
-        return True
 
 
 class ItemConverter(Transformer):
@@ -1,8 +1,7 @@
 # -*- coding: utf-8 -*-
 import asyncio
 import logging
-import random
-from string import ascii_letters, digits
+import secrets
 from typing import Optional, Union
 
 import discord
@@ -31,17 +30,19 @@ class DevCommands(AdventureMixin):
     async def no_dev_prompt(self, ctx: commands.Context) -> bool:
         if ctx.author.id in DEV_LIST:
             return True
-        confirm_token = "".join(random.choices((*ascii_letters, *digits), k=16))
+        confirm_token = secrets.token_urlsafe(12)
         await ctx.send(
             "**__You should not be running this command.__** "
             "Any issues that arise from you running this command will not be supported. "
             "If you wish to continue, enter this token as your next message."
             f"\n\n{confirm_token}"
         )
+        channel_id = ctx.channel.id
+        author_id = ctx.author.id
         try:
             message = await ctx.bot.wait_for(
                 "message",
-                check=lambda m: m.channel.id == ctx.channel.id and m.author.id == ctx.author.id,
+                check=lambda m: m.channel.id == channel_id and m.author.id == author_id,
                 timeout=60,
             )
         except asyncio.TimeoutError:
@@ -73,7 +74,10 @@ class DevCommands(AdventureMixin):
             return
         trader = Trader(60, ctx, self)
         await trader.start(ctx, bypass=True, stockcount=stockcount)
-        await asyncio.sleep(60)
+        self.tasks[ctx.message.id] = self.bot.loop.create_task(self._cart_timeout(trader, 60))
+
+    async def _cart_timeout(self, trader: Trader, delay: float):
+        await asyncio.sleep(delay)
         trader.stop()
         await trader.on_timeout()
 
@@ -137,13 +141,14 @@ class DevCommands(AdventureMixin):
                 await ctx.send("Level is too high.")
                 await ctx.send_help()
                 return
-        for target in targets:
+
+        async def rebirth_target(target: discord.Member):
             async with self.get_lock(target):
                 try:
                     c = await Character.from_json(ctx, self.config, target, self._daily_bonus)
                 except Exception as exc:
                     log.exception("Error with the new character sheet", exc_info=exc)
-                    continue
+                    return
                 bal = await bank.get_balance(target)
                 if bal >= 1000:
                     withdraw = bal - 1000
@@ -162,6 +167,9 @@ class DevCommands(AdventureMixin):
                     )
                 )
             await self._add_rewards(ctx, target, int((character_level) ** 3.5) + 1, 0, False)
+
+        # each target only touches their own data under their own lock
+        await asyncio.gather(*(rebirth_target(target) for target in targets))
         await ctx.tick()
 
     @commands.command()
@@ -172,18 +180,20 @@ class DevCommands(AdventureMixin):
         if not await self.no_dev_prompt(ctx):
             return
         targets = users or [ctx.author]
-        for target in targets:
+
+        async def reset_target(target: Union[discord.Member, discord.User]):
             async with self.get_lock(target):
-                try:
-                    c = await Character.from_json(ctx, self.config, target, self._daily_bonus)
-                except Exception as exc:
-                    log.exception("Error with the new character sheet", exc_info=exc)
-                    continue
-                c.heroclass["ability"] = False
-                c.heroclass["cooldown"] = 0
-                if "catch_cooldown" in c.heroclass:
-                    c.heroclass["catch_cooldown"] = 0
-                await self.config.user(target).set(await c.to_json(ctx, self.config))
+                user_config = self.config.user(target)
+                data = await user_config.all()
+                # resolved the same way Character.from_json picks it, older data only has "class"
+                heroclass = data.get("heroclass", data["class"])
+                heroclass["ability"] = False
+                heroclass["cooldown"] = 0
+                if "catch_cooldown" in heroclass:
+                    heroclass["catch_cooldown"] = 0
+                await user_config.set_raw("heroclass", value=heroclass)
+
+        await asyncio.gather(*(reset_target(target) for target in targets))
         await ctx.tick()
 
     @commands.command(name="adventureseed")
@@ -198,17 +208,15 @@ class DevCommands(AdventureMixin):
         c = await Character.from_json(ctx, self.config, ctx.author, self._daily_bonus)
         monster_roster, monster_stats, transcended = await self.update_monster_roster(c=c, rng=rng)
         challenge = await self.get_challenge(monster_roster, rng)
-        attribute = rng.choice(list(self.ATTRIBS.keys()))
-        monster = monster_roster[challenge].copy()
-        seed_box = box(hex(rng.internal_seed)[2:].upper())
+        attribute = rng.choice(self._attrib_keys)
+        monster = monster_roster[challenge]
+        seed_box = box(rng.internal_seed.to_hex())
 
         hp = monster["hp"]
         dipl = monster["dipl"]
         pdef = monster["pdef"]
         mdef = monster["mdef"]
         cdef = monster.get("cdef", 1.0)
-        boss = monster["boss"]
-        miniboss = monster["miniboss"]
         base_stats = f"HP: {hp}\nCHA: {dipl}\nPDEF: {pdef:0.2f}\nMDEF: {mdef:0.2f}\nCDEF: {cdef:0.2f}"
 
         dynamic_stats = self._dynamic_monster_stats(monster.copy(), rng)
@@ -248,15 +256,15 @@ class DevCommands(AdventureMixin):
             embed.add_field(name="No Monster", value=str(no_monster))
         if no_monster_30:
             embed.add_field(name="No Monster under 30 rebirths", value=str(no_monster_30))
-        if boss:
+        if boss := monster.get("boss"):
             embed.add_field(name="Boss", value=str(boss))
-        if miniboss:
+        if miniboss := monster.get("miniboss"):
             requirements = ", ".join(i for i in miniboss.get("requirements", []))
             embed.add_field(name="Miniboss", value=f"{requirements}")
         if transcended:
             embed.add_field(name="Transcended", value=str(transcended))
-        if monster.get("image", None):
-            embed.set_image(url=monster["image"])
+        if image := monster.get("image"):
+            embed.set_image(url=image)
         await ctx.send(embed=embed)
 
     @commands.command(name="adventurestats")
@@ -264,7 +272,7 @@ class DevCommands(AdventureMixin):
     @commands.is_owner()
     async def _adventurestats(self, ctx: commands.Context, guild: Optional[discord.Guild] = None):
         """[Owner] Show all current adventures."""
-        msg = bold(_("Active Adventures\n"))
+        parts = [bold(_("Active Adventures\n"))]
         embed_list = []
         if guild is None:
             guild: discord.Guild = ctx.guild
@@ -276,22 +284,24 @@ class DevCommands(AdventureMixin):
                 if server is None:
                     # should not happen but the type checker is happier
                     continue
-                pdef = adventure.monster_modified_stats["pdef"]
-                mdef = adventure.monster_modified_stats["mdef"]
-                cdef = adventure.monster_modified_stats.get("cdef", 1.0)
+                monster_stats = adventure.monster_modified_stats
+                pdef = monster_stats["pdef"]
+                mdef = monster_stats["mdef"]
+                cdef = monster_stats.get("cdef", 1.0)
                 hp = adventure.monster_hp()
                 dipl = adventure.monster_dipl()
-                seed = hex(adventure.rng.internal_seed)[2:].upper()
-                msg += (
+                seed = adventure.rng.internal_seed.to_hex()
+                parts.append(
                     f"{server.name} - "
                     f"[{adventure.challenge}]({adventure.message.jump_url})\n"
                     f"(hp:**{hp}**-char:**{dipl}**-pdef:**{pdef:0.2f}**-mdef:**{mdef:0.2f}**-cdef:**{cdef:0.2f}**)\n"
                     f"{box(seed)}\n\n"
                 )
         else:
-            msg += "None.\n\n"
+            parts.append("None.\n\n")
         stats = self._adv_results.get_stat_range(guild)
         stats_msg = _("Stats for {guild_name}\n{stats}").format(guild_name=guild.name, stats=str(stats))
+        msg = "".join(parts)
         for page in pagify(msg, delims=["\n\n"], page_length=2048):
             embed = discord.Embed(description=page)
             embed.add_field(name=_("Guild Stats"), value=stats_msg)
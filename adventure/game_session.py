@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import re
 import time
-from datetime import datetime
 from enum import Enum
 from typing import Dict, List, Mapping, MutableMapping, Optional, Set, Tuple
 
@@ -14,7 +15,7 @@ from redbot.core.utils.chat_formatting import box, humanize_list, humanize_numbe
 from .abc import AdventureMixin
 from .charsheet import Character, has_funds
 from .constants import HeroClasses
-from .helpers import escape, smart_embed
+from .helpers import _CLASS_COOLDOWNS, _ability_cooldown, _insight_roll_range, escape, smart_embed
 from .rng import Random
 
 # This is split into its own file for future buttons usage
@@ -34,58 +35,76 @@ class Action(Enum):
 
     @property
     def emoji(self):
-        return {
-            Action.fight: "\N{DAGGER KNIFE}\N{VARIATION SELECTOR-16}",
-            Action.talk: "\N{LEFT SPEECH BUBBLE}\N{VARIATION SELECTOR-16}",
-            Action.pray: "\N{PERSON WITH FOLDED HANDS}",
-            Action.magic: "\N{SPARKLES}",
-            Action.run: "\N{RUNNER}\N{ZERO WIDTH JOINER}\N{MALE SIGN}\N{VARIATION SELECTOR-16}",
-        }[self]
+        return _ACTION_EMOJIS[self]
+
+    @property
+    def label(self):
+        return _ACTION_LABELS[self]
+
+
+_ACTION_EMOJIS = {
+    Action.fight: "\N{DAGGER KNIFE}\N{VARIATION SELECTOR-16}",
+    Action.talk: "\N{LEFT SPEECH BUBBLE}\N{VARIATION SELECTOR-16}",
+    Action.pray: "\N{PERSON WITH FOLDED HANDS}",
+    Action.magic: "\N{SPARKLES}",
+    Action.run: "\N{RUNNER}\N{ZERO WIDTH JOINER}\N{MALE SIGN}\N{VARIATION SELECTOR-16}",
+}
+_ACTION_LABELS = {a: a.name.title() for a in Action}
+_RESPONSE_VARS = re.compile(r"\$(pet|monster|weapon|god)")
 
 
 class ActionButton(discord.ui.Button):
     def __init__(self, action: Action):
         self.action = action
-        super().__init__(label=self.action.name.title(), emoji=self.action.emoji)
+        super().__init__(label=self.action.label, emoji=self.action.emoji)
 
     async def send_response(self, interaction: discord.Interaction):
         user = interaction.user
-        try:
-            c = await Character.from_json(self.view.ctx, self.view.cog.config, user, self.view.cog._daily_bonus)
-        except Exception as exc:
-            log.exception("Error with the new character sheet", exc_info=exc)
-            pass
-        choices = self.view.cog.ACTION_RESPONSE.get(self.action.name, {})
+        # the sheet only flavours the reply, so one load per hero is enough for the whole adventure
+        c = self.view._response_chars.get(user.id)
+        if c is None:
+            try:
+                c = await Character.from_json(self.view.ctx, self.view.cog.config, user, self.view.cog._daily_bonus)
+            except Exception as exc:
+                log.exception("Error with the new character sheet", exc_info=exc)
+                pass
+            else:
+                self.view._response_chars[user.id] = c
+        choices = self.view.cog._action_responses.get(self.action.name, {})
         heroclass = c.hc.name
         pet = ""
         if c.hc is HeroClasses.ranger:
             pet = c.heroclass.get("pet", {}).get("name", _("pet you would have if you had a pet"))
 
-        choice = self.view.rng.choice(choices[heroclass] + choices["hero"])
-        choice = choice.replace("$pet", pet)
-        choice = choice.replace("$monster", self.view.challenge_name())
-        weapon = c.get_weapons()
-        choice = choice.replace("$weapon", weapon)
-        god = await self.view.cog.config.god_name()
-        if await self.view.cog.config.guild(interaction.guild).god_name():
-            god = await self.view.cog.config.guild(interaction.guild).god_name()
-        choice = choice.replace("$god", god)
+        choice = self.view.rng.choice(choices[heroclass])
+        if "$" in choice:
+            subs = {
+                "pet": pet,
+                "monster": self.view.challenge_name(),
+                "weapon": c.get_weapons(),
+                "god": await self.view.get_god_name(),
+            }
+            choice = _RESPONSE_VARS.sub(lambda m: subs[m.group(1)], choice)
         await smart_embed(message=box(choice, lang="ansi"), ephemeral=True, interaction=interaction)
 
     async def callback(self, interaction: discord.Interaction):
         await interaction.response.defer()
         user = interaction.user
+        members = getattr(self.view, self.action.name)
+        if user in members:
+            await smart_embed(message="You are already fighting this monster.", ephemeral=True, interaction=interaction)
+            return
         for action in Action:
             if action is self.action:
                 continue
-            if user in getattr(self.view, action.name, []):
-                getattr(self.view, action.name).remove(user)
-        if user not in getattr(self.view, self.action.name):
-            getattr(self.view, self.action.name).append(user)
-            await self.send_response(interaction)
-            await self.view.update()
-        else:
-            await smart_embed(message="You are already fighting this monster.", ephemeral=True, interaction=interaction)
+            previous = getattr(self.view, action.name)
+            if user in previous:
+                # a hero only ever has one action so there is nothing left to look for
+                previous.remove(user)
+                break
+        members.append(user)
+        await self.send_response(interaction)
+        await self.view.update()
 
 
 class SpecialActionButton(discord.ui.Button):
@@ -124,13 +143,14 @@ class SpecialActionButton(discord.ui.Button):
             await self.send_in_use(interaction)
             return
         else:
-            cooldown_time = max(300, (1200 - max((c.luck + c.total_int) * 2, 0)))
+            cooldown_time = _CLASS_COOLDOWNS[HeroClasses.cleric](c)[0]
             if "cooldown" not in c.heroclass:
                 c.heroclass["cooldown"] = cooldown_time + 1
-            if c.heroclass["cooldown"] <= time.time():
+            now = time.time()
+            if c.heroclass["cooldown"] <= now:
                 c.heroclass["ability"] = True
-                c.heroclass["cooldown"] = time.time() + cooldown_time
-                await self.view.cog.config.user(user).set(await c.to_json(self.view.ctx, self.view.cog.config))
+                c.heroclass["cooldown"] = now + cooldown_time
+                await self.view.cog.config.user(user).set_raw("heroclass", value=c.heroclass)
                 msg = _("{bless} **{c}** is starting an inspiring sermon. {bless}").format(
                     c=escape(user.display_name), bless=self.view.cog.emojis.skills.bless
                 )
@@ -143,12 +163,13 @@ class SpecialActionButton(discord.ui.Button):
         if c.heroclass["ability"]:
             await self.send_in_use(interaction)
             return
-        cooldown_time = max(300, (900 - max((c.luck + c.total_cha) * 2, 0)))
+        cooldown_time = _ability_cooldown(c, 300, 900, c.total_cha)
         if "cooldown" not in c.heroclass:
             c.heroclass["cooldown"] = cooldown_time + 1
-        if c.heroclass["cooldown"] <= time.time():
-            max_roll = 100 if c.rebirths >= 30 else 50 if c.rebirths >= 15 else 20
-            roll = self.view.rng.randint(min(c.rebirths - 25 // 2, (max_roll // 2)), max_roll) / max_roll
+        now = time.time()
+        if c.heroclass["cooldown"] <= now:
+            min_roll, max_roll = _insight_roll_range(c.rebirths)
+            roll = self.view.rng.randint(min_roll, max_roll) / max_roll
             if self.view.insight[0] < roll:
                 self.view.insight = roll, c
                 good = True
@@ -162,9 +183,9 @@ class SpecialActionButton(discord.ui.Button):
                     cog=self.view.cog,
                 )
             c.heroclass["ability"] = True
-            c.heroclass["cooldown"] = time.time() + cooldown_time
+            c.heroclass["cooldown"] = now + cooldown_time
 
-            await self.view.cog.config.user(user).set(await c.to_json(self.view.ctx, self.view.cog.config))
+            await self.view.cog.config.user(user).set_raw("heroclass", value=c.heroclass)
             if good:
                 msg = _("{skill} **{c}** is focusing on the monster ahead...{skill}").format(
                     c=escape(user.display_name),
@@ -181,11 +202,10 @@ class SpecialActionButton(discord.ui.Button):
                     if roll >= 0.4:
                         msg += _("You are struggling to find anything in your current adventure.")
                 else:
-                    pdef = session.monster_modified_stats["pdef"]
-                    mdef = session.monster_modified_stats["mdef"]
-                    cdef = session.monster_modified_stats.get("cdef", 1.0)
-                    hp = session.monster_modified_stats["hp"]
-                    diplo = session.monster_modified_stats["dipl"]
+                    monster_stats = session.monster_modified_stats
+                    pdef = monster_stats["pdef"]
+                    mdef = monster_stats["mdef"]
+                    cdef = monster_stats.get("cdef", 1.0)
                     if roll == 1:
                         hp = session.monster_hp()
                         dipl = session.monster_dipl()
@@ -299,77 +319,51 @@ class SpecialActionButton(discord.ui.Button):
         else:
             await self.send_cooldown(interaction, c, cooldown_time)
 
-    async def send_rage(self, interaction: discord.Interaction, c: Character):
+    async def send_basic_ability(self, interaction: discord.Interaction, c: Character, skill: str, activated_msg: str):
         user = interaction.user
-        if c.heroclass["ability"] is True:
+        if c.heroclass["ability"]:
             await self.send_in_use(interaction)
             return
-        cooldown_time = max(300, (1200 - max((c.luck + c.total_att) * 2, 0)))
+        cooldown_time = _CLASS_COOLDOWNS[c.hc](c)[0]
         if "cooldown" not in c.heroclass:
             c.heroclass["cooldown"] = cooldown_time + 1
-        if c.heroclass["cooldown"] <= time.time():
+        now = time.time()
+        if c.heroclass["cooldown"] <= now:
             c.heroclass["ability"] = True
-            c.heroclass["cooldown"] = time.time() + cooldown_time
-            await self.view.cog.config.user(user).set(await c.to_json(self.view.ctx, self.view.cog.config))
+            c.heroclass["cooldown"] = now + cooldown_time
+            await self.view.cog.config.user(user).set_raw("heroclass", value=c.heroclass)
             await smart_embed(
                 None,
-                _("{skill} **{c}** is starting to froth at the mouth... {skill}").format(
-                    c=escape(user.display_name),
-                    skill=self.view.cog.emojis.skills.berserker,
-                ),
+                activated_msg.format(c=escape(user.display_name), skill=skill),
                 cog=self.view.cog,
                 interaction=interaction,
             )
         else:
             await self.send_cooldown(interaction, c, cooldown_time)
 
-    async def send_focus(self, interaction: discord.Interaction, c: Character):
-        user = interaction.user
-        if c.heroclass["ability"] is True:
-            await self.send_in_use(interaction)
-            return
-        cooldown_time = max(300, (1200 - max((c.luck + c.total_int) * 2, 0)))
-        if "cooldown" not in c.heroclass:
-            c.heroclass["cooldown"] = cooldown_time + 1
-        if c.heroclass["cooldown"] <= time.time():
-            c.heroclass["ability"] = True
-            c.heroclass["cooldown"] = time.time() + cooldown_time
+    async def send_rage(self, interaction: discord.Interaction, c: Character):
+        await self.send_basic_ability(
+            interaction,
+            c,
+            self.view.cog.emojis.skills.berserker,
+            _("{skill} **{c}** is starting to froth at the mouth... {skill}"),
+        )
 
-            await self.view.cog.config.user(user).set(await c.to_json(self.view.ctx, self.view.cog.config))
-            await smart_embed(
-                None,
-                _("{skill} **{c}** is focusing all of their energy... {skill}").format(
-                    c=escape(user.display_name),
-                    skill=self.view.cog.emojis.skills.wizzard,
-                ),
-                cog=self.view.cog,
-                interaction=interaction,
-            )
-        else:
-            await self.send_cooldown(interaction, c, cooldown_time)
+    async def send_focus(self, interaction: discord.Interaction, c: Character):
+        await self.send_basic_ability(
+            interaction,
+            c,
+            self.view.cog.emojis.skills.wizzard,
+            _("{skill} **{c}** is focusing all of their energy... {skill}"),
+        )
 
     async def send_music(self, interaction: discord.Interaction, c: Character):
-        user = interaction.user
-        if c.heroclass["ability"]:
-            await self.send_in_use(interaction)
-            return
-        cooldown_time = max(300, (1200 - max((c.luck + c.total_cha) * 2, 0)))
-        if "cooldown" not in c.heroclass:
-            c.heroclass["cooldown"] = cooldown_time + 1
-        if c.heroclass["cooldown"] <= time.time():
-            c.heroclass["ability"] = True
-            c.heroclass["cooldown"] = time.time() + cooldown_time
-            await self.view.cog.config.user(user).set(await c.to_json(self.view.ctx, self.view.cog.config))
-            await smart_embed(
-                None,
-                _("{skill} **{c}** is whipping up a performance... {skill}").format(
-                    c=escape(user.display_name), skill=self.view.cog.emojis.skills.bard
-                ),
-                cog=self.view.cog,
-                interaction=interaction,
-            )
-        else:
-            await self.send_cooldown(interaction, c, cooldown_time)
+        await self.send_basic_ability(
+            interaction,
+            c,
+            self.view.cog.emojis.skills.bard,
+            _("{skill} **{c}** is whipping up a performance... {skill}"),
+        )
 
     async def not_in_adventure(self, interaction: discord.Interaction):
         msg = _("**{user}**, you need to be participating in this adventure to use this ability.").format(
@@ -402,14 +396,14 @@ class SpecialActionButton(discord.ui.Button):
                 return
             if c.hc is HeroClasses.cleric:
                 await self.send_cleric(interaction, c)
-            if c.hc is HeroClasses.psychic:
+            elif c.hc is HeroClasses.psychic:
                 log.debug("Psychic used special action")
                 await self.send_insight(interaction, c)
-            if c.hc is HeroClasses.berserker:
+            elif c.hc is HeroClasses.berserker:
                 await self.send_rage(interaction, c)
-            if c.hc is HeroClasses.wizard:
+            elif c.hc is HeroClasses.wizard:
                 await self.send_focus(interaction, c)
-            if c.hc is HeroClasses.bard:
+            elif c.hc is HeroClasses.bard:
                 await self.send_music(interaction, c)
 
 
@@ -426,25 +420,28 @@ class GameSession(discord.ui.View):
     miniboss: dict
     monster: dict
     message_id: int
-    reacted: bool = False
-    participants: Set[discord.Member] = set()
-    monster_modified_stats: MutableMapping = {}
-    fight: List[discord.Member] = []
-    magic: List[discord.Member] = []
-    talk: List[discord.Member] = []
-    pray: List[discord.Member] = []
-    run: List[discord.Member] = []
-    message: discord.Message = None
-    transcended: bool = False
-    insight: Tuple[float, Character] = (0, None)
-    start_time: datetime = datetime.now()
-    easy_mode: bool = False
-    insight = (0, None)
-    no_monster: bool = False
-    exposed: bool = False
-    finished: bool = False
+    reacted: bool
+    participants: Set[discord.Member]
+    monster_modified_stats: MutableMapping
+    fight: List[discord.Member]
+    magic: List[discord.Member]
+    talk: List[discord.Member]
+    pray: List[discord.Member]
+    run: List[discord.Member]
+    message: discord.Message
+    transcended: bool
+    insight: Tuple[float, Character]
+    start_time: float
+    easy_mode: bool
+    no_monster: bool
+    exposed: bool
+    finished: bool
     rng: Random
     _last_update: Dict[Action, int]
+    _god_name: Optional[str]
+    _update_task: Optional[asyncio.Task]
+    _update_pending: bool
+    _response_chars: Dict[int, Character]
 
     def __init__(self, **kwargs):
         self.ctx: Context = kwargs.pop("ctx")
@@ -472,13 +469,16 @@ class GameSession(discord.ui.View):
         self.run: List[discord.Member] = []
         self.transcended: bool = kwargs.pop("transcended", False)
         self.insight: Tuple[float, Character] = (0, None)
-        self.start_time = datetime.now()
+        self.start_time: float = time.monotonic()
         self.easy_mode = kwargs.get("easy_mode", False)
         self.no_monster = kwargs.get("no_monster", False)
+        self.exposed: bool = False
+        self.finished: bool = False
         self.possessed = self.attribute == " possessed"
         self.immortal = self.attribute == "n immortal"
         self.ascended = "Ascended" in self.challenge
         self.rng = kwargs["rng"]
+        self._god_name: Optional[str] = None
         super().__init__(timeout=self.timer)
         self.attack_button = ActionButton(Action.fight)
         self.talk_button = ActionButton(Action.talk)
@@ -493,6 +493,9 @@ class GameSession(discord.ui.View):
         self.add_item(self.run_button)
         self.add_item(self.special_button)
         self._last_update: Dict[Action, int] = {a: 0 for a in Action}
+        self._update_task: Optional[asyncio.Task] = None
+        self._update_pending: bool = False
+        self._response_chars: Dict[int, Character] = {}
 
     def monster_hp(self) -> int:
         return max(int(self.monster_modified_stats.get("hp", 0) * self.attribute_stats[0] * self.monster_stats), 1)
@@ -501,6 +504,27 @@ class GameSession(discord.ui.View):
         return max(int(self.monster_modified_stats.get("dipl", 0) * self.attribute_stats[1] * self.monster_stats), 1)
 
     async def update(self):
+        # a burst of clicks only needs the final button counts, so they share one edit
+        self._update_pending = True
+        if self._update_task is None or self._update_task.done():
+            self._update_task = asyncio.create_task(self._flush_update())
+
+    async def _flush_update(self):
+        await asyncio.sleep(0.3)
+        while self._update_pending and not self.finished and not self.is_finished():
+            self._update_pending = False
+            try:
+                await self._edit_buttons()
+            except Exception:
+                log.exception("Error updating the adventure buttons")
+                return
+
+    def stop(self):
+        if self._update_task is not None and not self._update_task.done():
+            self._update_task.cancel()
+        super().stop()
+
+    async def _edit_buttons(self):
         buttons = {
             Action.fight: self.attack_button,
             Action.talk: self.talk_button,
@@ -508,28 +532,31 @@ class GameSession(discord.ui.View):
             Action.pray: self.pray_button,
             Action.run: self.run_button,
         }
+        counts = {}
         for action in Action:
-            if len(getattr(self, action.name, [])) != self._last_update[action]:
-                new_number = len(getattr(self, action.name, []))
-                self._last_update[action] = new_number
+            new_number = len(getattr(self, action.name, []))
+            if new_number != self._last_update[action]:
+                counts[action] = new_number
                 if new_number != 0:
-                    buttons[action].label = buttons[action].action.name.title() + f" ({new_number})"
+                    buttons[action].label = f"{action.label} ({new_number})"
                 else:
-                    buttons[action].label = buttons[action].action.name.title()
-        await self.message.edit(view=self)
+                    buttons[action].label = action.label
+        if counts:
+            await self.message.edit(view=self)
+            # only recorded once the edit went through so a failed edit is retried by the next update
+            self._last_update.update(counts)
 
     def in_adventure(self, user: discord.Member) -> bool:
-        participants_ids = set(
-            p.id
-            for p in [
-                *self.fight,
-                *self.magic,
-                *self.pray,
-                *self.talk,
-                *self.run,
-            ]
+        user_id = user.id
+        return any(
+            p.id == user_id for members in (self.fight, self.magic, self.pray, self.talk, self.run) for p in members
         )
-        return bool(user.id in participants_ids)
+
+    async def get_god_name(self) -> str:
+        """The guild's god name, or the global one, looked up once per adventure."""
+        if self._god_name is None:
+            self._god_name = await self.cog.config.guild(self.guild).god_name() or await self.cog.config.god_name()
+        return self._god_name
 
     def challenge_name(self):
         if self.easy_mode:
@@ -563,16 +590,14 @@ class GameSession(discord.ui.View):
             return False
         if await self.cog.config.restrict():
             user = interaction.user
-            all_users = []
-            in_adventure = False
-            for guild_session in self.cog._sessions.values():
-                if guild_session.ctx.message.id == self.ctx.message.id:
-                    continue
-                if guild_session.in_adventure(user):
-                    in_adventure = True
+            message_id = self.ctx.message.id
+            in_adventure = any(
+                guild_session.in_adventure(user)
+                for guild_session in self.cog._sessions.values()
+                if guild_session.ctx.message.id != message_id
+            )
 
             if in_adventure:
-                user_id = f"{user.id}-{user.guild.id}"
                 # iterating through reactions here and removing them seems to be expensive
                 # so they can just keep their react on the adventures they can't join
                 await interaction.response.send_message(
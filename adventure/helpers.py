@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import functools
+import math
 import random
-import re
 import time
 from enum import Enum
-from typing import TYPE_CHECKING, Optional, Union
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple, Union
 
 import discord
 from discord.ext.commands import CheckFailure
@@ -14,20 +15,59 @@ from redbot.core.utils.chat_formatting import escape as _escape
 from redbot.core.utils.common_filters import filter_various_mentions
 
 from .charsheet import Character, Item
-from .constants import DEV_LIST, Rarities
+from .constants import DEV_LIST, HeroClasses, Rarities
 
 _ = Translator("Adventure", __file__)
 
 if TYPE_CHECKING:
     from .abc import AdventureMixin
 
-
-async def _get_epoch(seconds: int):
+_SELL_BASE = {
+    Rarities.ascended: (5000, 10000),
+    Rarities.legendary: (1000, 2000),
+    Rarities.epic: (500, 750),
+    Rarities.rare: (250, 500),
+}
+_TITLE_EXCEPTIONS = frozenset(("a", "and", "in", "of", "or", "the"))
+_SUCCESS_COLOUR = discord.Colour.dark_green()
+_FAILURE_COLOUR = discord.Colour.dark_red()
+# (minimum rebirths, max insight roll, half of it) from the highest tier down
+_INSIGHT_BOUNDS = ((30, 100, 50), (15, 50, 25), (0, 20, 10))
+
+
+def _insight_roll_range(rebirths: int) -> Tuple[int, int]:
+    """The lowest and highest insight roll for a psychic with this many rebirths."""
+    max_roll, half_roll = next((m, h) for r, m, h in _INSIGHT_BOUNDS if rebirths >= r)
+    return min(max((rebirths - 25) // 2, 0), half_roll), max_roll
+
+
+def _ability_cooldown(c: Character, floor: int, ceiling: int, stat: int) -> int:
+    # seconds, shortened by twice the character's luck plus the given stat
+    return max(floor, ceiling - max((c.luck + stat) * 2, 0))
+
+
+# (ability cooldown, pet catch cooldown) in seconds for each class
+_CLASS_COOLDOWNS: Dict[HeroClasses, Callable[[Character], Tuple[int, Optional[int]]]] = {
+    HeroClasses.wizard: lambda c: (_ability_cooldown(c, 300, 1200, c.total_int), None),
+    HeroClasses.cleric: lambda c: (_ability_cooldown(c, 300, 1200, c.total_int), None),
+    HeroClasses.ranger: lambda c: (
+        _ability_cooldown(c, 1800, 7200, c.total_int),
+        _ability_cooldown(c, 600, 3600, c.total_int),
+    ),
+    HeroClasses.berserker: lambda c: (_ability_cooldown(c, 300, 1200, c.total_att), None),
+    HeroClasses.bard: lambda c: (_ability_cooldown(c, 300, 1200, c.total_cha), None),
+    HeroClasses.tinkerer: lambda c: (_ability_cooldown(c, 900, 3600, c.total_int), None),
+    HeroClasses.psychic: lambda c: (_ability_cooldown(c, 300, 900, -c.total_cha), None),
+}
+
+
+def _get_epoch(seconds: int):
     epoch = time.time()
     epoch += seconds
     return epoch
 
 
+@functools.lru_cache(maxsize=1024)
 def escape(t: str) -> str:
     return _escape(filter_various_mentions(t), mass_mentions=True, formatting=True)
 
@@ -52,18 +92,6 @@ async def smart_embed(
         bot = ctx.bot
         guild = ctx.guild
         channel = ctx.channel
-    if success is True:
-        colour = discord.Colour.dark_green()
-    elif success is False:
-        colour = discord.Colour.dark_red()
-    elif embed_colour is not None:
-        try:
-            colour = discord.Colour.from_str(embed_colour)
-        except (ValueError, TypeError):
-            colour = await bot.get_embed_colour(channel)
-    else:
-        colour = await bot.get_embed_colour(channel)
-
     if cog is None:
         cog = bot.get_cog("Adventure")
     if guild:
@@ -71,6 +99,17 @@ async def smart_embed(
     else:
         use_embeds = True or await bot.embed_requested(channel)
     if use_embeds:
+        if success is True:
+            colour = _SUCCESS_COLOUR
+        elif success is False:
+            colour = _FAILURE_COLOUR
+        elif embed_colour is not None:
+            try:
+                colour = discord.Colour.from_str(embed_colour)
+            except (ValueError, TypeError):
+                colour = await bot.get_embed_colour(channel)
+        else:
+            colour = await bot.get_embed_colour(channel)
         embed = discord.Embed(description=message, color=colour)
         if image:
             embed.set_thumbnail(url=image)
@@ -95,32 +134,21 @@ async def smart_embed(
 
 
 def check_running_adventure(ctx):
-    for guild_id, session in ctx.bot.get_cog("Adventure")._sessions.items():
-        user_ids: list = []
-        options = ["fight", "magic", "talk", "pray", "run"]
-        for i in options:
-            user_ids += [u.id for u in getattr(session, i)]
-        if ctx.author.id in user_ids:
-            return False
-    return True
+    return not any(session.in_adventure(ctx.author) for session in ctx.bot.get_cog("Adventure")._sessions.values())
 
 
-async def _title_case(phrase: str):
-    exceptions = ["a", "and", "in", "of", "or", "the"]
-    lowercase_words = re.split(" ", phrase.lower())
+def _title_case(phrase: str):
+    lowercase_words = phrase.lower().split(" ")
     final_words = [lowercase_words[0].capitalize()]
-    final_words += [word if word in exceptions else word.capitalize() for word in lowercase_words[1:]]
+    final_words += [word if word in _TITLE_EXCEPTIONS else word.capitalize() for word in lowercase_words[1:]]
     return " ".join(final_words)
 
 
-async def _remaining(epoch):
+def _remaining(epoch):
     remaining = epoch - time.time()
     finish = remaining < 0
-    m, s = divmod(remaining, 60)
-    h, m = divmod(m, 60)
-    s = int(s)
-    m = int(m)
-    h = int(h)
+    h, m = divmod(math.floor(remaining), 3600)
+    m, s = divmod(m, 60)
     if h == 0 and m == 0:
         out = "{:02d}".format(s)
     elif h == 0:
@@ -131,25 +159,11 @@ async def _remaining(epoch):
 
 
 def _sell(c: Character, item: Item, *, amount: int = 1):
-    if item.rarity is Rarities.ascended:
-        base = (5000, 10000)
-    elif item.rarity is Rarities.legendary:
-        base = (1000, 2000)
-    elif item.rarity is Rarities.epic:
-        base = (500, 750)
-    elif item.rarity is Rarities.rare:
-        base = (250, 500)
-    else:
-        base = (10, 100)
+    base = _SELL_BASE.get(item.rarity, (10, 100))
     price = random.randint(base[0], base[1]) * abs(item.max_main_stat)
     price += price * max(int((c.total_cha) / 1000), -1)
-
-    if c.luck > 0:
-        price = price + round(price * (c.luck / 1000))
-    if c.luck < 0:
-        price = price - round(price * (abs(c.luck) / 1000))
-    if price < 0:
-        price = 0
+    # round() is symmetric around zero so one expression covers good and bad luck
+    price = max(price + round(price * (c.luck / 1000)), 0)
     price += round(price * min(0.1 * c.rebirths / 15, 0.4))
 
     return max(price, base[0])
@@ -168,11 +182,24 @@ def has_separated_economy():
     return check(predicate)
 
 
-class ConfirmView(discord.ui.View):
-    def __init__(self, timeout: float, author: Union[discord.User, discord.Member], *, get_name: bool = False):
+class AuthorOnlyView(discord.ui.View):
+    """A view that only responds to the user it was created for."""
+
+    def __init__(self, timeout: float, author: Union[discord.User, discord.Member]):
         super().__init__(timeout=timeout)
-        self.confirmed = None
         self.author = author
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.author.id:
+            await interaction.response.send_message(_("You are not authorized to interact with this."), ephemeral=True)
+            return False
+        return True
+
+
+class ConfirmView(AuthorOnlyView):
+    def __init__(self, timeout: float, author: Union[discord.User, discord.Member], *, get_name: bool = False):
+        super().__init__(timeout, author)
+        self.confirmed = None
         self.message: Optional[discord.Message] = None
         self.name_button = ForgeNameButton()
         self.item_name = None
@@ -195,12 +222,6 @@ class ConfirmView(discord.ui.View):
         self.confirmed = False
         self.stop()
 
-    async def interaction_check(self, interaction: discord.Interaction) -> bool:
-        if interaction.user.id != self.author.id:
-            await interaction.response.send_message(_("You are not authorized to interact with this."), ephemeral=True)
-            return False
-        return True
-
 
 class NameModal(discord.ui.Modal):
     def __init__(self, view: discord.ui.View):
@@ -234,11 +255,10 @@ class LootSellEnum(Enum):
     sell = 2
 
 
-class LootView(discord.ui.View):
+class LootView(AuthorOnlyView):
     def __init__(self, timeout: float, author: discord.User):
-        super().__init__(timeout=timeout)
+        super().__init__(timeout, author)
         self.result = LootSellEnum.put_away
-        self.author = author
 
     @discord.ui.button(label=_("Equip"), style=discord.ButtonStyle.green)
     async def equip_button(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -257,9 +277,3 @@ class LootView(discord.ui.View):
         await interaction.response.defer()
         self.result = LootSellEnum.put_away
         self.stop()
-
-    async def interaction_check(self, interaction: discord.Interaction) -> bool:
-        if interaction.user.id != self.author.id:
-            await interaction.response.send_message(_("You are not authorized to interact with this."), ephemeral=True)
-            return False
-        return True
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import asyncio
 import logging
 import time
 
@@ -40,21 +41,17 @@ class RebirthCommands(AdventureMixin):
             if not c.last_currency_check + 10 < time.time():
                 return await smart_embed(ctx, _("You need to wait a little before rebirthing.").format(c=c))
             if not await bank.is_global():
-                rebirth_cost = await self.config.guild(ctx.guild).rebirth_cost()
+                rebirth_cost_value = self.config.guild(ctx.guild).rebirth_cost
             else:
-                rebirth_cost = await self.config.rebirth_cost()
+                rebirth_cost_value = self.config.rebirth_cost
+            rebirth_cost, bal, currency_name = await asyncio.gather(
+                rebirth_cost_value(), bank.get_balance(ctx.author), bank.get_currency_name(ctx.guild)
+            )
             base_cost = 1000 * c.rebirths
             current_balance = c.bal
             last_known_currency = c.last_known_currency
-            bal = await bank.get_balance(ctx.author)
             withdraw = max(base_cost, int(max((bal - base_cost), 1) * (rebirth_cost / 100.0)))
-            currency_name = await bank.get_currency_name(
-                ctx.guild,
-            )
             if last_known_currency and current_balance / last_known_currency < 0.25:
-                currency_name = await bank.get_currency_name(
-                    ctx.guild,
-                )
                 return await smart_embed(
                     ctx,
                     _(
@@ -77,6 +74,7 @@ class RebirthCommands(AdventureMixin):
                     ),
                 )
             space = "\N{EN SPACE}"
+            withdraw_str = humanize_number(withdraw)
             view = ConfirmView(60, ctx.author)
             open_msg = await smart_embed(
                 ctx,
@@ -92,7 +90,7 @@ class RebirthCommands(AdventureMixin):
                     "for acquiring more powerful items, a higher max level, and the "
                     "ability to convert chests to higher rarities after the second rebirth.\n\n"
                     "Would you like to rebirth?"
-                ).format(cost=humanize_number(withdraw), space=space * 4, currency=currency_name),
+                ).format(cost=withdraw_str, space=space * 4, currency=currency_name),
                 view=view,
             )
             await view.wait()
@@ -136,7 +134,7 @@ class RebirthCommands(AdventureMixin):
                 content=box(
                     _("{c}, congratulations on your rebirth.\nYou paid {bal}.").format(
                         c=escape(ctx.author.display_name),
-                        bal=humanize_number(withdraw),
+                        bal=withdraw_str,
                     ),
                     lang="ansi",
                 ),
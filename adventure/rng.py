@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import random
+from typing import Optional
 
 from .adventureresult import StatRange
 
@@ -34,6 +35,8 @@ class GameSeed:
     Custom monsters with higher stats will break this if they go above 16383.
     """
 
+    __slots__ = ("stat_range", "message_id", "_int")
+
     TIMESTAMP_SHIFT = 38
     # This number should always be a multiple of 2
     HP_SHIFT = TIMESTAMP_SHIFT - 1
@@ -43,28 +46,38 @@ class GameSeed:
     # We want to encode the min and max stat within half of what is left
     # all of these variables are included to more easily adjust this
     # If any value is changed past adventure results RNG will differ
+    STAT_MASK = (1 << 14) - 1
+    WIN_PCT_MASK = (1 << MAX_STAT_SHIFT) - 1
 
     def __init__(self, message_id: int, stats: StatRange):
         self.stat_range = stats
         self.message_id = message_id
+        self._int: Optional[int] = None
 
     def __int__(self):
-        ret = self.timestamp() << self.TIMESTAMP_SHIFT
+        if self._int is None:
+            self._int = self._pack()
+        return self._int
+
+    def _pack(self) -> int:
+        stats = self.stat_range
         # Store the timestamp in the same place as discord leaving 22 bits left
-        hp = self.hp_or_diplo() << self.HP_SHIFT
+        ret = (self.message_id >> self.TIMESTAMP_SHIFT) << self.TIMESTAMP_SHIFT
         # Store whether or not to prefer hp or dipl as the 21st bit
-        min_s = self.min_stat() << self.MIN_STAT_SHIFT
+        ret += (1 if stats.stat_type == "hp" else 0) << self.HP_SHIFT
         # Store the min stat 10 bits in leaving the last 10 bits for the max stat
-        max_s = self.max_stat() << self.MAX_STAT_SHIFT
-        win_pct = round(self.win_pct() * 100)
+        ret += max(int(stats.min_stat), 0) << self.MIN_STAT_SHIFT
+        ret += min(int(stats.max_stat), 16383) << self.MAX_STAT_SHIFT
         # Python doesn't like converting some values to a float and casting to int
         # will cause it to round down even though it should round up
-        ret += hp + min_s + max_s + win_pct
-        return ret
+        return ret + round(stats.win_percent * 100)
 
     def __index__(self):
         return int(self)
 
+    def to_hex(self) -> str:
+        return f"{int(self):X}"
+
     def hp_or_diplo(self):
         return 1 if self.stat_range.stat_type == "hp" else 0
 
@@ -83,25 +96,13 @@ class GameSeed:
 
     @classmethod
     def from_int(cls, number: int) -> GameSeed:
-
-        message_id = number >> cls.TIMESTAMP_SHIFT
-        # strip the stats data
-        number ^= message_id << cls.TIMESTAMP_SHIFT
-
-        message_id = message_id << cls.TIMESTAMP_SHIFT
-        # xor the timestamp to get the remaining stats
-        hp_or_diplo = number >> cls.HP_SHIFT
-        # strip the min and max stats to get whether to prioritize hp or dipl
-        number ^= hp_or_diplo << cls.HP_SHIFT
-        # xor the hp value to get just min and max
-        min_stat = number >> cls.MIN_STAT_SHIFT
-        # Strip the min stat from the data
-        number ^= min_stat << cls.MIN_STAT_SHIFT
-        max_stat = number >> cls.MAX_STAT_SHIFT
-
-        number ^= max_stat << cls.MAX_STAT_SHIFT
-        win_percent = number / 100
-        # Leaving us with just the max stat as the last 10 bits of data
+        # Keep the timestamp where discord stores it so the message ID lines up
+        message_id = (number >> cls.TIMESTAMP_SHIFT) << cls.TIMESTAMP_SHIFT
+        hp_or_diplo = (number >> cls.HP_SHIFT) & 1
+        min_stat = (number >> cls.MIN_STAT_SHIFT) & cls.STAT_MASK
+        max_stat = (number >> cls.MAX_STAT_SHIFT) & cls.STAT_MASK
+        # Leaving us with just the win percentage in the last 9 bits
+        win_percent = (number & cls.WIN_PCT_MASK) / 100
         stat_type = "hp" if hp_or_diplo else "dipl"
         stats = StatRange(stat_type=stat_type, min_stat=min_stat, max_stat=max_stat, win_percent=win_percent)
         return cls(message_id, stats)
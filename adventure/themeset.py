@@ -111,6 +111,7 @@ class ThemesetCommands(AdventureMixin):
             if pet in config_data[theme]["pet"]:
                 updated = True
             config_data[theme]["pet"][pet] = pet_data
+        self._pet_list = None
 
         pet_bonuses = pet_data.pop("bonuses", {})
         text = _(
@@ -180,6 +181,7 @@ class ThemesetCommands(AdventureMixin):
                 text = _("Pet: `{pet}` does not exist in `{theme}` theme").format(pet=pet, theme=theme)
                 await smart_embed(ctx, text)
                 return
+        self._pet_list = None
 
         text = _("Pet: `{pet}` has been deleted from the `{theme}` theme").format(pet=pet, theme=theme)
         await smart_embed(ctx, text)